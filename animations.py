@@ -0,0 +1,100 @@
+import io
+
+import numpy as np
+
+from bloch_cache import BlochImageCache, render_bloch_png
+from quantum_engine import propagation_profile, rotate_batch
+
+# Pre-rendered animations: every frame is rendered up front and encoded into
+# one animated image, so playback happens in the browser instead of the
+# script thread pushing a new figure per frame.
+# Pillow and matplotlib are imported on first use so that importing this
+# module stays cheap for the app's cold start.
+
+ANIMATION_FORMATS = ["GIF", "APNG"]
+
+# Animation frames are smaller than the main Bloch view, so they get their
+# own cache instead of sharing entries with the 200 dpi renders
+FRAME_CACHE = BlochImageCache(render=lambda vector: render_bloch_png(vector, dpi=100))
+
+
+def frame_duration_ms(animation_speed):
+    # Same pacing as the live loop's time.sleep(0.1 / speed); browsers
+    # slow down GIF frames shorter than 20 ms, so clamp there
+    return max(20, int(round(100 / animation_speed)))
+
+
+def rotation_frames(initial_state, axis, angle_radians, num_steps):
+    angles = np.linspace(0, angle_radians, num_steps)
+    amplitudes, _ = rotate_batch(initial_state, axis, angles)
+    return [FRAME_CACHE.get_png(state) for state in amplitudes]
+
+
+def faraday_frames(initial_angle, faraday_angle_deg, path_length, magnetic_field, num_steps):
+    from faraday_plot import FaradayRenderer
+
+    angles_through_medium, distances = propagation_profile(faraday_angle_deg, path_length, num_steps)
+    renderer = FaradayRenderer(initial_angle, magnetic_field, dpi=80)
+    return [
+        renderer.render(rotation_angle, distance)
+        for rotation_angle, distance in zip(angles_through_medium, distances)
+    ]
+
+
+def encode_animation(frames, duration_ms, fmt="GIF"):
+    from PIL import Image
+
+    if fmt not in ANIMATION_FORMATS:
+        raise ValueError(f"Unknown animation format: {fmt!r}")
+
+    # Frames are either encoded PNG bytes or RGBA arrays straight from a canvas
+    images = [
+        Image.open(io.BytesIO(frame)).convert("RGB") if isinstance(frame, bytes)
+        else Image.fromarray(frame).convert("RGB")
+        for frame in frames
+    ]
+
+    # Tight bounding boxes can differ by a pixel or two between frames, so
+    # centre every frame on a canvas of the largest size
+    width = max(image.width for image in images)
+    height = max(image.height for image in images)
+    canvas_frames = []
+    for image in images:
+        if image.size != (width, height):
+            canvas = Image.new("RGB", (width, height), "white")
+            canvas.paste(image, ((width - image.width) // 2, (height - image.height) // 2))
+            image = canvas
+        canvas_frames.append(image)
+
+    if fmt == "GIF":
+        # One shared palette keeps unchanged pixels identical between frames,
+        # which lets the GIF encoder store only the moving parts. The first
+        # and last frames together contain every colour the animation uses.
+        sample = Image.new("RGB", (width * 2, height), "white")
+        sample.paste(canvas_frames[0], (0, 0))
+        sample.paste(canvas_frames[-1], (width, 0))
+        palette = sample.quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+        canvas_frames = [image.quantize(palette=palette, dither=Image.Dither.NONE) for image in canvas_frames]
+
+    buffer = io.BytesIO()
+    canvas_frames[0].save(
+        buffer,
+        format="GIF" if fmt == "GIF" else "PNG",
+        save_all=True,
+        append_images=canvas_frames[1:],
+        duration=duration_ms,
+        loop=0,
+        optimize=fmt == "GIF",
+    )
+    return buffer.getvalue()
+
+
+def rotation_animation(initial_state, axis, angle_degrees, num_steps, animation_speed, fmt="GIF"):
+    frames = rotation_frames(initial_state, axis, np.deg2rad(angle_degrees), num_steps)
+    return encode_animation(frames, frame_duration_ms(animation_speed), fmt)
+
+
+def faraday_animation(initial_angle, faraday_angle_deg, path_length, magnetic_field,
+                      num_steps, animation_speed, fmt="GIF"):
+    frames = faraday_frames(initial_angle, faraday_angle_deg, path_length, magnetic_field, num_steps)
+    return encode_animation(frames, frame_duration_ms(animation_speed), fmt)
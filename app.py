@@ -1,11 +1,80 @@
+import os
 import streamlit as st
-from qiskit import QuantumCircuit
-from qiskit.quantum_info import Statevector
-from qiskit.visualization import plot_bloch_multivector
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import numpy as np
+from quantum_engine import (
+    simulate_gate, state_metrics, build_circuit,
+    rotate_batch, rotation_sweep, simulate_rotation, build_rotation_circuit, bloch_vector,
+    POLARIZATION_ANGLES, faraday_rotation, propagation_profile, faraday_state, jones_vector,
+    VERDET_RANGE, FIELD_RANGE, LENGTH_RANGE, ISOLATOR_ROTATION, faraday_grid, polarization_offset,
+)
+from optics import CHAIN_PRESETS, ELEMENT_TYPES, OpticalChain, intensity, isolation_db
+from bloch_cache import bloch_png, bloch_vector_png
+from circuit_cache import circuit_svg
+from assets import font_face_css, profile_picture
+from tab_state import last_result, latency_panel, record_stage, stage, store_result, tab_fragment
+from profiler import start_exporters
+from bloch_component import bloch_sphere
+from animations import ANIMATION_FORMATS, frame_duration_ms, rotation_animation, faraday_animation
+
+# Qiskit and matplotlib are imported inside the branches that simulate or
+# render, so tabs that never use them do not pay for the import. The backend
+# is chosen through the environment because matplotlib is not loaded yet.
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+# Stage metrics endpoint / log line, if configured (see profiler.py)
+start_exporters()
+
+# Pre-rendered animations are shared across sessions and keyed by their parameters
+cached_rotation_animation = st.cache_data(max_entries=32, show_spinner="🎞️ Rendering animation...")(rotation_animation)
+cached_faraday_animation = st.cache_data(max_entries=32, show_spinner="🎞️ Rendering animation...")(faraday_animation)
+
+# Parameter-space explorer planes: index of the (V, B, L) axis held fixed at
+# its slider value, then the labels of the two plotted axes
+EXPLORER_PLANES = {
+    "B × L": (0, "Magnetic Field B (T)", "Path Length L (m)"),
+    "Verdet × B": (2, "Verdet Constant V (rad/T·m)", "Magnetic Field B (T)"),
+    "Verdet × L": (1, "Verdet Constant V (rad/T·m)", "Path Length L (m)"),
+}
+
+
+def explorer_axes(grid_points):
+    return [np.linspace(*limits, grid_points) for limits in (VERDET_RANGE, FIELD_RANGE, LENGTH_RANGE)]
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def isolating_fraction(grid_points, tolerance):
+    # Share of the whole (V, B, L) grid within `tolerance` degrees of an
+    # isolating rotation (45° + k·90°), and the seconds the pass over the grid
+    # took; polarization and analyzer do not enter. The stage is recorded
+    # here, so only a computation is timed, never a cache hit.
+    import time
+
+    started = time.perf_counter()
+    verdet_axis, field_axis, length_axis = explorer_axes(grid_points)
+    rotation = np.rad2deg(faraday_rotation(verdet_axis[:, None, None], field_axis[None, :, None], length_axis[None, None, :]))
+    fraction = float(np.mean(np.abs(polarization_offset(rotation)) <= tolerance))
+    seconds = time.perf_counter() - started
+    record_stage("explorer grid", seconds)
+    return fraction, seconds
+
+
+@st.cache_data(max_entries=32, show_spinner="🗺️ Rendering map...")
+def parameter_map_png(plane, analyzer_angle, grid_points, initial_angle, slice_index, marker):
+    # Heatmaps of one plane of the grid as PNG. Only that 2-D slice is
+    # computed; matplotlib is imported here, on first use.
+    import io
+    from faraday_plot import draw_parameter_map
+    
+    fixed, x_label, y_label = EXPLORER_PLANES[plane]
+    axes = explorer_axes(grid_points)
+    axes[fixed] = axes[fixed][slice_index:slice_index + 1]
+    rotation_slice, intensity_slice = faraday_grid(*axes, initial_angle, analyzer_angle)
+    x_axis, y_axis = (axis for i, axis in enumerate(axes) if i != fixed)
+    fig = draw_parameter_map(x_axis, y_axis, rotation_slice.squeeze(fixed), intensity_slice.squeeze(fixed),
+                             x_label, y_label, analyzer_angle, marker)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
 
 # Page configuration
 st.set_page_config(
@@ -15,15 +84,15 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# Poppins, self-hosted from static/fonts/ (see assets.py)
+st.markdown(f"<style>{font_face_css()}</style>", unsafe_allow_html=True)
+
 # Dark Mode Compatible CSS
 st.markdown("""
     <style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;600;700&display=swap');
-    
     /* Global Styles */
     * {
-        font-family: 'Poppins', sans-serif;
+        font-family: 'Poppins', system-ui, -apple-system, 'Segoe UI', Roboto, sans-serif;
     }
     
     /* Main Header */
@@ -189,32 +258,6 @@ st.markdown("""
         color: white !important;
     }
     
-    /* Custom link button */
-    .custom-link-button {
-        display: inline-block;
-        width: 100%;
-        padding: 1.2rem 2rem;
-        font-size: 1.3rem;
-        font-weight: 700;
-        color: white;
-        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        border: none;
-        border-radius: 15px;
-        cursor: pointer;
-        text-align: center;
-        text-decoration: none;
-        box-shadow: 0 8px 25px rgba(245, 87, 108, 0.4);
-        transition: all 0.3s ease;
-        text-transform: uppercase;
-        letter-spacing: 2px;
-    }
-    
-    .custom-link-button:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 12px 35px rgba(245, 87, 108, 0.6);
-        background: linear-gradient(135deg, #f5576c 0%, #f093fb 100%);
-    }
-    
     /* Profile Cards - Dark Mode Compatible */
     .profile-card {
         background: rgba(102, 126, 234, 0.05);
@@ -301,16 +344,37 @@ st.markdown('<p class="subtitle">Explore the fascinating world of quantum comput
 st.markdown('<p class="subtitle">Vellore Institute of Technology | Chennai </p>', unsafe_allow_html=True)
 
 
+# Display settings
+with st.sidebar:
+    st.markdown("### 🖥️ Display Settings")
+    bloch_renderer = st.radio(
+        "**Bloch sphere:**",
+        ["Interactive (browser)", "Image (server)"],
+        key="bloch_renderer",
+        help="Interactive spheres are drawn by your browser from the Bloch vector alone"
+    )
+    # The profiler is hidden unless the page is opened with ?debug=1
+    if st.query_params.get("debug") == "1":
+        st.checkbox(
+            "🐞 Show profiler",
+            key="debug_latency",
+            help="Times every tab run and every stage inside tabs 1-3"
+        )
+interactive_bloch = bloch_renderer == "Interactive (browser)"
+
 # Create tabs with icons
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
+tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
     "🎯 Standard Gates",
     "🌀 Rotation Gates",
     "🔮 Faraday Rotator",
     "🔐 BB84 Protocol",
+    "🧮 Circuit Builder",
+    "🌫️ Noise Channels",
     "🧑‍🔬 About Us"
 ])
 
-with tab1:
+@tab_fragment("Standard Gates")
+def standard_gates_tab():
     st.markdown('<p class="section-header">Standard Quantum Gates</p>', unsafe_allow_html=True)
     
     col1, col2 = st.columns([1, 2])
@@ -341,6 +405,12 @@ with tab1:
         st.markdown("---")
         apply_button = st.button("🚀 Apply Gate", use_container_width=True)
         
+        gate_inputs = (original_bit, gate)
+        if apply_button:
+            with stage("simulate"):
+                gate_state = simulate_gate(original_bit, gate)
+            store_result("gate", gate_inputs, gate_state)
+        
         # Gate information
         gate_info_dict = {
             "Identity": "No change - Identity operation",
@@ -365,77 +435,59 @@ with tab1:
     with col2:
         st.markdown("### 📊 Quantum State Visualization")
         
-        if apply_button:
-            qc = QuantumCircuit(1)
-            
-            # Set initial state
-            if original_bit == "|1⟩":
-                qc.x(0)
-            elif original_bit == "|+⟩":
-                qc.h(0)
-            elif original_bit == "|-⟩":
-                qc.x(0)
-                qc.h(0)
-            
-            # Apply gate
-            if gate != "Identity":
-                if gate == "X (NOT)":
-                    qc.x(0)
-                elif gate == "Y":
-                    qc.y(0)
-                elif gate == "Z":
-                    qc.z(0)
-                elif gate == "H (Hadamard)":
-                    qc.h(0)
-                elif gate == "S (Phase)":
-                    qc.s(0)
-                elif gate == "T":
-                    qc.t(0)
-                elif gate == "S† (S-dagger)":
-                    qc.sdg(0)
-                elif gate == "T† (T-dagger)":
-                    qc.tdg(0)
-            
-            state = Statevector.from_instruction(qc)
-            state_array = state.data
+        # Shown until the state or gate selection changes
+        state_array = last_result("gate", gate_inputs)
+        if state_array is not None:
+            metrics = state_metrics(state_array)
             
             # Display state info
             col_a, col_b, col_c = st.columns(3)
             with col_a:
-                st.metric("α (|0⟩)", f"{state_array[0]:.3f}")
+                st.metric("α (|0⟩)", f"{metrics['alpha']:.3f}")
             with col_b:
-                st.metric("β (|1⟩)", f"{state_array[1]:.3f}")
+                st.metric("β (|1⟩)", f"{metrics['beta']:.3f}")
             with col_c:
-                st.metric("Phase", f"{np.angle(state_array[1]):.3f} rad")
+                st.metric("Phase", f"{metrics['phase']:.3f} rad")
             
             st.markdown("---")
             
             col_p1, col_p2 = st.columns(2)
             with col_p1:
-                st.metric("P(|0⟩)", f"{abs(state_array[0])**2:.4f}")
+                st.metric("P(|0⟩)", f"{metrics['p0']:.4f}")
             with col_p2:
-                st.metric("P(|1⟩)", f"{abs(state_array[1])**2:.4f}")
+                st.metric("P(|1⟩)", f"{metrics['p1']:.4f}")
             
             st.markdown("---")
             
             # Bloch sphere
-            fig = plot_bloch_multivector(state)
-            st.pyplot(fig)
-            plt.close()
+            with stage("bloch render"):
+                if interactive_bloch:
+                    bloch_sphere(bloch_vector(state_array), key="gate_bloch")
+                else:
+                    st.image(bloch_png(state_array), use_container_width=True)
             
             # Circuit diagram
             st.markdown("**Quantum Circuit:**")
-            try:
-                circuit_fig = qc.draw(output='mpl', style='iqp')
-                st.pyplot(circuit_fig)
-                plt.close()
-            except:
-                st.code(qc.draw(output='text'), language='text')
+            with stage("circuit build"):
+                qc = build_circuit(original_bit, gate)
+            with stage("circuit draw"):
+                # Cached by circuit content, so re-applying the same gate skips the mpl render
+                circuit_diagram, draw_error = circuit_svg(qc)
+                if circuit_diagram is not None:
+                    st.image(circuit_diagram, use_container_width=True)
+                else:
+                    st.code(qc.draw(output='text'), language='text')
+                    st.caption(f"Text diagram shown because the mpl drawer failed: {draw_error}")
         
         else:
             st.info("👆 Configure your quantum gate and click 'Apply Gate' to see the magic!")
 
-with tab2:
+
+with tab1:
+    standard_gates_tab()
+
+@tab_fragment("Rotation Gates")
+def rotation_gates_tab():
     st.markdown('<p class="section-header">Rotation Gates with Animation</p>', unsafe_allow_html=True)
     
     col1, col2 = st.columns([1, 2])
@@ -443,11 +495,22 @@ with tab2:
     with col1:
         st.markdown("### 🎚️ Rotation Controls")
         
-        initial_state = st.selectbox("**Initial State:**", ["|0⟩", "|1⟩", "|+⟩", "|-⟩"], key="rot_state")
-        
-        st.markdown("---")
+        rotation_mode = st.radio(
+            "**Mode:**",
+            ["Single angle", "Sweep"],
+            horizontal=True,
+            key="rot_mode",
+            help="Sweep evaluates every initial state and axis over a dense angle grid and updates live"
+        )
+        sweep_mode = rotation_mode == "Sweep"
         
-        rotation_axis = st.radio("**Rotation Axis:**", ["X", "Y", "Z"])
+        # A sweep covers every initial state and axis at once
+        if not sweep_mode:
+            initial_state = st.selectbox("**Initial State:**", ["|0⟩", "|1⟩", "|+⟩", "|-⟩"], key="rot_state")
+            
+            st.markdown("---")
+            
+            rotation_axis = st.radio("**Rotation Axis:**", ["X", "Y", "Z"])
         
         angle_degrees = st.slider(
             "**Rotation Angle (degrees):**",
@@ -470,51 +533,147 @@ with tab2:
         
         st.markdown("---")
         
-        animate = st.checkbox("🎬 Show rotation animation", value=False)
-        
-        if animate:
-            num_steps = st.slider("Animation steps:", 5, 50, 20)
-            animation_speed = st.slider("Animation speed:", 1, 10, 5)
-        
-        apply_rotation = st.button("🔄 Apply Rotation", use_container_width=True, key="apply_rot")
+        if sweep_mode:
+            sweep_range = st.slider("**Sweep range (degrees):**", 0, 720, (0, 360), step=15, key="rot_sweep_range")
+            sweep_points = st.select_slider(
+                "**Angles per curve:**",
+                options=[1_000, 10_000, 100_000],
+                value=10_000,
+                format_func=lambda n: f"{n:,}",
+                key="rot_sweep_points"
+            )
+            sweep_quantity = st.radio(
+                "**Plot:**",
+                ["P(|0⟩)", "P(|1⟩)", "Phase", "Bloch x", "Bloch y", "Bloch z"],
+                horizontal=True,
+                key="rot_sweep_quantity"
+            )
+            animate = False
+            apply_rotation = False
+        else:
+            animate = st.checkbox("🎬 Show rotation animation", value=False)
+            num_steps = animation_speed = rotation_playback = rotation_format = None
+            
+            if animate:
+                num_steps = st.slider("Animation steps:", 5, 50, 20)
+                animation_speed = st.slider("Animation speed:", 1, 10, 5)
+                # The interactive sphere always plays the trajectory in the browser
+                if not interactive_bloch:
+                    rotation_playback = st.radio(
+                        "Playback:",
+                        ["Live", "Pre-rendered"],
+                        horizontal=True,
+                        key="rot_playback",
+                        help="Pre-rendered encodes all frames into one animation that plays in your browser"
+                    )
+                    if rotation_playback == "Pre-rendered":
+                        rotation_format = st.selectbox("Format:", ANIMATION_FORMATS, key="rot_format")
+            
+            apply_rotation = st.button("🔄 Apply Rotation", use_container_width=True, key="apply_rot")
+            
+            # The physics keys the stored state. The animation settings it was
+            # applied with are stored next to it, so a changed setting never
+            # replays or re-renders it without a click; the renderer is applied
+            # when it is displayed.
+            rotation_inputs = (initial_state, rotation_axis, angle_degrees)
+            rotation_animation = (num_steps, animation_speed, rotation_playback, rotation_format) if animate else None
+            if apply_rotation:
+                with stage("simulate"):
+                    rotation_result = simulate_rotation(initial_state, rotation_axis, angle_radians)
+                store_result("rotation", rotation_inputs, (rotation_result, rotation_animation))
     
     with col2:
         st.markdown("### 📊 Rotation Visualization")
         
-        if apply_rotation:
-            if animate:
-                angles = np.linspace(0, angle_radians, num_steps)
+        # Shown until the state, axis or angle changes
+        stored_rotation = None if sweep_mode else last_result("rotation", rotation_inputs)
+        rotation_state, applied_animation = stored_rotation or (None, None)
+        
+        if sweep_mode:
+            import time
+            
+            # Every state x axis x angle in one vectorized call; cheap enough
+            # to redo on every widget change, so there is no Apply button
+            started = time.perf_counter()
+            sweep = rotation_sweep(np.deg2rad(np.linspace(sweep_range[0], sweep_range[1], sweep_points)))
+            sweep_ms = (time.perf_counter() - started) * 1e3
+            
+            def sweep_quantity_of(result):
+                return {
+                    "P(|0⟩)": result['p0'],
+                    "P(|1⟩)": result['p1'],
+                    "Phase": result['phase'],
+                    "Bloch x": result['bloch'][..., 0],
+                    "Bloch y": result['bloch'][..., 1],
+                    "Bloch z": result['bloch'][..., 2],
+                }[sweep_quantity]
+            
+            quantity = sweep_quantity_of(sweep)
+            
+            # Charts get at most ~1000 points per curve to keep the page light
+            stride = max(1, sweep_points // 1000)
+            degrees = np.rad2deg(sweep['angles'])
+            for axis_index, chart_column in enumerate(st.columns(3)):
+                with chart_column:
+                    st.markdown(f"**R{sweep['axes'][axis_index].lower()}(θ)**")
+                    chart_data = {"angle (°)": degrees[::stride]}
+                    for state_index, state_name in enumerate(sweep['states']):
+                        chart_data[state_name] = quantity[state_index, axis_index, ::stride]
+                    st.line_chart(chart_data, x="angle (°)", height=260)
+            
+            st.caption(f"{len(sweep['states'])} states × {len(sweep['axes'])} axes × {sweep_points:,} angles "
+                       f"computed in {sweep_ms:.1f} ms")
+            
+            # The angle slider acts as a cursor into the sweep
+            cursor = sweep_quantity_of(rotation_sweep([angle_radians]))[..., 0]
+            st.markdown(f"**{sweep_quantity} at θ = {angle_degrees}°:**")
+            st.dataframe({
+                f"R{axis.lower()}": {state: round(float(cursor[s_i, a_i]), 4) for s_i, state in enumerate(sweep['states'])}
+                for a_i, axis in enumerate(sweep['axes'])
+            }, use_container_width=True)
+        
+        elif rotation_state is not None:
+            if (animate and applied_animation == rotation_animation
+                    and (interactive_bloch or rotation_playback == "Pre-rendered")):
+                if interactive_bloch:
+                    with stage("bloch render"):
+                        angles = np.linspace(0, angle_radians, num_steps)
+                        _, trajectory = rotate_batch(initial_state, rotation_axis, angles)
+                        bloch_sphere(trajectory=trajectory, frame_ms=frame_duration_ms(animation_speed), key="rot_bloch")
+                else:
+                    with stage("animation render"):
+                        animation_bytes = cached_rotation_animation(
+                            initial_state, rotation_axis, angle_degrees, num_steps, animation_speed, rotation_format
+                        )
+                    with stage("st.image"):
+                        st.image(animation_bytes, use_container_width=True)
                 
-                initial_qc = QuantumCircuit(1)
-                if initial_state == "|1⟩":
-                    initial_qc.x(0)
-                elif initial_state == "|+⟩":
-                    initial_qc.h(0)
-                elif initial_state == "|-⟩":
-                    initial_qc.x(0)
-                    initial_qc.h(0)
+                state_array = rotation_state
+                col_1, col_2 = st.columns(2)
+                with col_1:
+                    st.metric("|α|²", f"{abs(state_array[0])**2:.3f}")
+                with col_2:
+                    st.metric("|β|²", f"{abs(state_array[1])**2:.3f}")
                 
-                initial_statevector = Statevector.from_instruction(initial_qc)
+                st.success("✅ Animation ready!")
+                
+            elif animate and apply_rotation:
+                # The live animation only plays on the click itself; later
+                # reruns show the final state below
+                angles = np.linspace(0, angle_radians, num_steps)
+                
+                # All frames are computed in one vectorized call
+                with stage("simulate frames"):
+                    amplitudes, _ = rotate_batch(initial_state, rotation_axis, angles)
                 
                 animation_placeholder = st.empty()
                 progress_bar = st.progress(0)
                 
                 import time
                 
-                for i, current_angle in enumerate(angles):
-                    rotation_qc = QuantumCircuit(1)
-                    
-                    if rotation_axis == "X":
-                        rotation_qc.rx(current_angle, 0)
-                    elif rotation_axis == "Y":
-                        rotation_qc.ry(current_angle, 0)
-                    else:
-                        rotation_qc.rz(current_angle, 0)
-                    
-                    state = initial_statevector.evolve(rotation_qc)
-                    state_array = state.data
-                    
-                    fig = plot_bloch_multivector(state)
+                for i, (current_angle, state_array) in enumerate(zip(angles, amplitudes)):
+                    with stage("bloch render"):
+                        bloch_image = bloch_png(state_array)
                     
                     with animation_placeholder.container():
                         col_a, col_b, col_c = st.columns(3)
@@ -525,7 +684,8 @@ with tab2:
                         with col_c:
                             st.metric("Progress", f"{((i+1)/num_steps)*100:.0f}%")
                         
-                        st.pyplot(fig)
+                        with stage("st.image"):
+                            st.image(bloch_image, use_container_width=True)
                         
                         col_1, col_2 = st.columns(2)
                         with col_1:
@@ -533,33 +693,15 @@ with tab2:
                         with col_2:
                             st.metric("|β|²", f"{abs(state_array[1])**2:.3f}")
                     
-                    plt.close()
                     progress_bar.progress((i + 1) / num_steps)
-                    time.sleep(0.1 / animation_speed)
+                    with stage("sleep"):
+                        time.sleep(0.1 / animation_speed)
                 
                 progress_bar.empty()
                 st.success("✅ Animation complete!")
                 
             else:
-                qc = QuantumCircuit(1)
-                
-                if initial_state == "|1⟩":
-                    qc.x(0)
-                elif initial_state == "|+⟩":
-                    qc.h(0)
-                elif initial_state == "|-⟩":
-                    qc.x(0)
-                    qc.h(0)
-                
-                if rotation_axis == "X":
-                    qc.rx(angle_radians, 0)
-                elif rotation_axis == "Y":
-                    qc.ry(angle_radians, 0)
-                else:
-                    qc.rz(angle_radians, 0)
-                
-                state = Statevector.from_instruction(qc)
-                state_array = state.data
+                state_array = rotation_state
                 
                 col_a, col_b = st.columns(2)
                 with col_a:
@@ -569,22 +711,33 @@ with tab2:
                 
                 st.markdown("---")
                 
-                fig = plot_bloch_multivector(state)
-                st.pyplot(fig)
-                plt.close()
+                with stage("bloch render"):
+                    if interactive_bloch:
+                        bloch_sphere(bloch_vector(state_array), key="rot_bloch")
+                    else:
+                        st.image(bloch_png(state_array), use_container_width=True)
                 
                 st.markdown("**Circuit Diagram:**")
-                try:
-                    circuit_fig = qc.draw(output='mpl', style='iqp')
-                    st.pyplot(circuit_fig)
-                    plt.close()
-                except:
-                    st.code(qc.draw(output='text'), language='text')
+                with stage("circuit build"):
+                    qc = build_rotation_circuit(initial_state, rotation_axis, angle_radians)
+                with stage("circuit draw"):
+                    # Cached by circuit content, so re-applying the same gate skips the mpl render
+                    circuit_diagram, draw_error = circuit_svg(qc)
+                    if circuit_diagram is not None:
+                        st.image(circuit_diagram, use_container_width=True)
+                    else:
+                        st.code(qc.draw(output='text'), language='text')
+                        st.caption(f"Text diagram shown because the mpl drawer failed: {draw_error}")
         
         else:
             st.info("👆 Set your rotation parameters and click 'Apply Rotation'")
 
-with tab3:
+
+with tab2:
+    rotation_gates_tab()
+
+@tab_fragment("Faraday Rotator")
+def faraday_tab():
     st.markdown('<p class="section-header">Faraday Rotator Simulator</p>', unsafe_allow_html=True)
     
     st.markdown("""
@@ -633,7 +786,7 @@ with tab3:
             step=0.01
         )
         
-        faraday_angle = verdet_constant * magnetic_field * path_length
+        faraday_angle = faraday_rotation(verdet_constant, magnetic_field, path_length)
         faraday_angle_deg = np.rad2deg(faraday_angle) % 360
         
         st.markdown(f"""
@@ -647,170 +800,119 @@ with tab3:
         st.markdown("---")
         
         show_faraday_animation = st.checkbox("🎬 Animate propagation", value=True, key="faraday_anim")
+        propagation_steps = animation_speed = faraday_playback = faraday_format = None
         
         if show_faraday_animation:
             propagation_steps = st.slider("Steps:", 10, 50, 25, key="faraday_steps")
             animation_speed = st.slider("Speed:", 1, 10, 5, key="anim_speed")
+            faraday_playback = st.radio(
+                "Playback:",
+                ["Live", "Pre-rendered"],
+                horizontal=True,
+                key="faraday_playback",
+                help="Pre-rendered encodes all frames into one animation that plays in your browser"
+            )
+            if faraday_playback == "Pre-rendered":
+                faraday_format = st.selectbox("Format:", ANIMATION_FORMATS, key="faraday_format")
         
         simulate_faraday = st.button("🔬 Run Simulation", use_container_width=True)
+        
+        # The animation settings are part of the key; the renderer is not, it
+        # is applied when the result is displayed
+        faraday_inputs = (initial_polarization, verdet_constant, magnetic_field, path_length,
+                          (show_faraday_animation, propagation_steps, animation_speed, faraday_playback, faraday_format))
+        if simulate_faraday:
+            with stage("simulate"):
+                faraday_states = faraday_state(initial_polarization, faraday_angle)
+            store_result("faraday", faraday_inputs, faraday_states)
     
     with col2:
         st.markdown("### 📊 Polarization Evolution")
         
-        if simulate_faraday:
-            if initial_polarization == "Horizontal (|H⟩)":
-                initial_angle = 0
-            elif initial_polarization == "Vertical (|V⟩)":
-                initial_angle = 90
-            elif initial_polarization == "Diagonal (+45°)":
-                initial_angle = 45
-            else:
-                initial_angle = -45
+        # Shown until the polarization or any slider changes
+        faraday_result = last_result("faraday", faraday_inputs)
+        if faraday_result is not None:
+            initial_angle = POLARIZATION_ANGLES[initial_polarization]
             
             if show_faraday_animation:
-                angles_through_medium = np.linspace(0, faraday_angle_deg, propagation_steps)
-                distances = np.linspace(0, path_length, propagation_steps)
-                
-                animation_placeholder = st.empty()
-                progress_bar = st.progress(0)
-                
-                import time
-                
-                for i, (rotation_angle, current_distance) in enumerate(zip(angles_through_medium, distances)):
-                    current_pol_angle = initial_angle + rotation_angle
-                    
-                    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-                    
-                    # 3D wave visualization
-                    ax1 = plt.subplot(121, projection='3d')
-                    z = np.linspace(0, 2*np.pi, 100)
-                    angle_rad = np.deg2rad(current_pol_angle)
-                    Ex = np.cos(angle_rad) * np.sin(z)
-                    Ey = np.sin(angle_rad) * np.sin(z)
-                    
-                    ax1.plot(Ex, Ey, z, 'b-', linewidth=2.5, label='E-field', alpha=0.8)
-                    
-                    arrow_length = 1.2
-                    ax1.quiver(0, 0, 0, 
-                              arrow_length * np.cos(angle_rad), 
-                              arrow_length * np.sin(angle_rad), 
-                              0,
-                              color='red', arrow_length_ratio=0.3, linewidth=4,
-                              label=f'Pol: {current_pol_angle:.1f}°')
-                    
-                    ax1.set_xlabel('Ex (H)', fontsize=11, fontweight='bold')
-                    ax1.set_ylabel('Ey (V)', fontsize=11, fontweight='bold')
-                    ax1.set_zlabel('Propagation', fontsize=11, fontweight='bold')
-                    ax1.set_title(f'Light Wave\nDistance: {current_distance*100:.1f} cm', 
-                                 fontsize=13, fontweight='bold', color='#667eea')
-                    ax1.set_xlim([-1.5, 1.5])
-                    ax1.set_ylim([-1.5, 1.5])
-                    ax1.set_zlim([0, 2*np.pi])
-                    ax1.legend(loc='upper right', fontsize=9)
-                    ax1.view_init(elev=20, azim=45)
-                    ax1.grid(True, alpha=0.3)
-                    
-                    # Polarization plane view
-                    ax2.set_aspect('equal')
-                    
-                    # Reference axes
-                    ax2.arrow(0, 0, 1.2, 0, head_width=0.1, head_length=0.1, 
-                             fc='gray', ec='gray', alpha=0.3)
-                    ax2.arrow(0, 0, 0, 1.2, head_width=0.1, head_length=0.1, 
-                             fc='gray', ec='gray', alpha=0.3)
-                    ax2.text(1.35, 0, 'H', fontsize=13, ha='left', va='center', fontweight='bold')
-                    ax2.text(0, 1.35, 'V', fontsize=13, ha='center', va='bottom', fontweight='bold')
-                    
-                    # Initial polarization
-                    initial_rad = np.deg2rad(initial_angle)
-                    ax2.arrow(0, 0, np.cos(initial_rad), np.sin(initial_rad), 
-                             head_width=0.15, head_length=0.15, 
-                             fc='blue', ec='blue', alpha=0.3, linewidth=2.5,
-                             label=f'Initial: {initial_angle}°')
+                if faraday_playback == "Pre-rendered":
+                    with stage("animation render"):
+                        animation_bytes = cached_faraday_animation(
+                            initial_angle, faraday_angle_deg, path_length, magnetic_field,
+                            propagation_steps, animation_speed, faraday_format
+                        )
+                    with stage("st.image"):
+                        st.image(animation_bytes, use_container_width=True)
+                elif simulate_faraday:
+                    # The live animation only plays on the click itself
+                    angles_through_medium, distances = propagation_profile(faraday_angle_deg, path_length, propagation_steps)
                     
-                    # Current polarization
-                    ax2.arrow(0, 0, np.cos(angle_rad), np.sin(angle_rad), 
-                             head_width=0.15, head_length=0.15, 
-                             fc='red', ec='red', alpha=1.0, linewidth=3.5,
-                             label=f'Current: {current_pol_angle:.1f}°')
+                    animation_placeholder = st.empty()
+                    progress_bar = st.progress(0)
                     
-                    # Rotation arc
-                    if rotation_angle > 0:
-                        arc_angles = np.linspace(initial_rad, angle_rad, 50)
-                        arc_x = 0.5 * np.cos(arc_angles)
-                        arc_y = 0.5 * np.sin(arc_angles)
-                        ax2.plot(arc_x, arc_y, 'g--', linewidth=2.5, alpha=0.8)
-                        ax2.text(0, -0.8, f'Rotation: {rotation_angle:.1f}°', 
-                                fontsize=12, ha='center', color='green', 
-                                fontweight='bold', bbox=dict(boxstyle='round', 
-                                facecolor='lightgreen', alpha=0.5))
+                    import time
+                    from faraday_plot import FaradayRenderer
                     
-                    ax2.set_xlim([-1.6, 1.6])
-                    ax2.set_ylim([-1.6, 1.6])
-                    ax2.set_title(f'Polarization Plane\nB = {magnetic_field:.1f} T', 
-                                 fontsize=13, fontweight='bold', color='#667eea')
-                    ax2.legend(loc='upper right', fontsize=10)
-                    ax2.grid(True, alpha=0.3, linestyle='--')
-                    ax2.axhline(y=0, color='k', linewidth=0.8, alpha=0.3)
-                    ax2.axvline(x=0, color='k', linewidth=0.8, alpha=0.3)
+                    # One figure for the whole run; each step only redraws the moving artists
+                    renderer = FaradayRenderer(initial_angle, magnetic_field)
                     
-                    plt.tight_layout()
-                    
-                    with animation_placeholder.container():
-                        col_a, col_b, col_c = st.columns(3)
-                        with col_a:
-                            st.metric("Distance", f"{current_distance*100:.1f} cm", 
-                                     f"{(current_distance/path_length)*100:.0f}%")
-                        with col_b:
-                            st.metric("Rotation", f"{rotation_angle:.1f}°")
-                        with col_c:
-                            st.metric("Polarization", f"{current_pol_angle:.1f}°")
+                    for i, (rotation_angle, current_distance) in enumerate(zip(angles_through_medium, distances)):
+                        current_pol_angle = initial_angle + rotation_angle
                         
-                        st.pyplot(fig)
+                        with stage("frame render"):
+                            frame = renderer.render(rotation_angle, current_distance)
+                        
+                        with animation_placeholder.container():
+                            col_a, col_b, col_c = st.columns(3)
+                            with col_a:
+                                st.metric("Distance", f"{current_distance*100:.1f} cm", 
+                                         f"{(current_distance/path_length)*100:.0f}%")
+                            with col_b:
+                                st.metric("Rotation", f"{rotation_angle:.1f}°")
+                            with col_c:
+                                st.metric("Polarization", f"{current_pol_angle:.1f}°")
+                            
+                            with stage("st.image"):
+                                st.image(frame, use_container_width=True)
+                        
+                        progress_bar.progress((i + 1) / propagation_steps)
+                        with stage("sleep"):
+                            time.sleep(0.1 / animation_speed)
                     
-                    plt.close()
-                    progress_bar.progress((i + 1) / propagation_steps)
-                    time.sleep(0.1 / animation_speed)
+                    progress_bar.empty()
                 
-                progress_bar.empty()
                 st.success(f"✅ Polarization rotated from {initial_angle}° to {initial_angle + faraday_angle_deg:.1f}°")
                 
                 # Quantum state representation
                 st.markdown("---")
                 st.markdown("**⚛️ Quantum State Representation:**")
                 
-                qc_initial = QuantumCircuit(1)
-                if initial_polarization == "Horizontal (|H⟩)":
-                    pass
-                elif initial_polarization == "Vertical (|V⟩)":
-                    qc_initial.x(0)
-                elif initial_polarization == "Diagonal (+45°)":
-                    qc_initial.h(0)
-                else:
-                    qc_initial.x(0)
-                    qc_initial.h(0)
-                
-                initial_state = Statevector.from_instruction(qc_initial)
-                rotation_qc = QuantumCircuit(1)
-                rotation_qc.rz(2 * faraday_angle, 0)
-                final_state = initial_state.evolve(rotation_qc)
+                initial_state, final_state = faraday_result
                 
                 col1, col2 = st.columns(2)
                 with col1:
                     st.markdown("**Initial State**")
-                    fig = plot_bloch_multivector(initial_state)
-                    st.pyplot(fig)
-                    plt.close()
+                    with stage("bloch render"):
+                        if interactive_bloch:
+                            bloch_sphere(bloch_vector(initial_state), height=360, key="faraday_bloch_initial")
+                        else:
+                            st.image(bloch_png(initial_state), use_container_width=True)
                 with col2:
                     st.markdown("**Final State**")
-                    fig = plot_bloch_multivector(final_state)
-                    st.pyplot(fig)
-                    plt.close()
+                    with stage("bloch render"):
+                        if interactive_bloch:
+                            bloch_sphere(bloch_vector(final_state), height=360, key="faraday_bloch_final")
+                        else:
+                            st.image(bloch_png(final_state), use_container_width=True)
                 
             else:
                 # Static visualization
+                import time
+                import matplotlib.pyplot as plt
+                
                 final_pol_angle = initial_angle + faraday_angle_deg
                 
+                figure_started = time.perf_counter()
                 fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
                 
                 # 3D wave
@@ -880,15 +982,170 @@ with tab3:
                 ax2.axvline(x=0, color='k', linewidth=0.8, alpha=0.3)
                 
                 plt.tight_layout()
-                st.pyplot(fig)
+                record_stage("figure build", time.perf_counter() - figure_started)
+                with stage("st.pyplot"):
+                    st.pyplot(fig)
                 plt.close()
                 
                 st.success(f"✅ Polarization rotated by {faraday_angle_deg:.1f}°")
         
         else:
             st.info("👆 Configure parameters and click 'Run Simulation'")
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown('<p class="section-header">Parameter-Space Explorer</p>', unsafe_allow_html=True)
+    
+    # Off by default: the map is the heaviest part of the tab and needs matplotlib
+    show_explorer = st.toggle(
+        "🗺️ Show parameter-space explorer",
+        key="faraday_explorer",
+        help="Heatmaps of the rotation and transmitted intensity over the Verdet, B and L ranges"
+    )
+    
+    if show_explorer:
+        col1, col2 = st.columns([1, 2])
+        
+        with col1:
+            st.markdown("### 🗺️ Map Settings")
+            
+            explorer_plane = st.radio(
+                "**Heatmap axes:**",
+                list(EXPLORER_PLANES),
+                key="faraday_plane",
+                help="The remaining parameter is held at its slider value above"
+            )
+            analyzer_angle = st.slider("**Analyzer angle (degrees):**", min_value=-90, max_value=90, value=90, step=5, key="faraday_analyzer")
+            grid_points = st.select_slider(
+                "**Grid points per parameter:**",
+                options=[50, 100, 150, 200],
+                value=100,
+                format_func=lambda n: f"{n} ({n ** 3:,} total)",
+                key="faraday_grid"
+            )
+            isolator_tolerance = st.slider("**Isolator tolerance (± degrees):**", 0.5, 5.0, 1.0, step=0.5, key="faraday_tolerance")
+        
+        with col2:
+            # The isolating share covers the whole grid; the map only needs
+            # the plane through the current slider values. Both are cached.
+            isolating, grid_seconds = isolating_fraction(grid_points, isolator_tolerance)
+            
+            fixed, _, _ = EXPLORER_PLANES[explorer_plane]
+            settings = (verdet_constant, magnetic_field, path_length)
+            slice_index = int(np.abs(explorer_axes(grid_points)[fixed] - settings[fixed]).argmin())
+            marker = tuple(value for i, value in enumerate(settings) if i != fixed)
+            
+            col_a, col_b, col_c = st.columns(3)
+            with col_a:
+                st.metric("Grid Points", f"{grid_points ** 3:,}", f"computed in {grid_seconds * 1e3:.0f} ms", delta_color="off",
+                          help="Time of the vectorized pass over the grid; later runs reuse the cached result")
+            with col_b:
+                st.metric("Isolating Settings", f"{isolating * 100:.2f}%", f"within ±{isolator_tolerance}° of 45° + k·90°", delta_color="off")
+            with col_c:
+                vb = verdet_constant * magnetic_field
+                st.metric("L for 45° at current V, B", f"{np.deg2rad(ISOLATOR_ROTATION) / vb * 100:.2f} cm" if vb > 0 else "∞")
+            
+            with stage("explorer figure build"):
+                map_png = parameter_map_png(explorer_plane, analyzer_angle, grid_points,
+                                            POLARIZATION_ANGLES[initial_polarization], slice_index, marker)
+            with stage("explorer st.image"):
+                st.image(map_png, use_container_width=True)
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown('<p class="section-header">Optical Chain (Jones Calculus)</p>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.markdown("### 🔗 Elements")
+        
+        chain_preset = st.selectbox("**Start from:**", list(CHAIN_PRESETS.keys()), key="optics_preset")
+        link_rotation = st.checkbox(
+            "Faraday rotators use θ from the sliders above",
+            key="optics_link_rotation",
+            help=f"Currently θ = {faraday_angle_deg:.1f}°"
+        )
+        
+        # The editor is keyed by preset so picking another preset starts over
+        edited_elements = st.data_editor(
+            [{"Element": kind, "Angle (°)": angle} for kind, angle in CHAIN_PRESETS[chain_preset]],
+            column_config={
+                "Element": st.column_config.SelectboxColumn(options=list(ELEMENT_TYPES.keys()), required=True),
+                "Angle (°)": st.column_config.NumberColumn(
+                    min_value=-360.0, max_value=360.0, step=0.5, default=0.0,
+                    help="Transmission axis, fast axis or Faraday rotation; ignored for mirrors"
+                ),
+            },
+            num_rows="dynamic",
+            use_container_width=True,
+            key=f"optics_editor_{chain_preset}"
+        )
+        st.caption("Light enters at the first row. Backward light enters at the last row.")
+    
+    with col2:
+        chain_elements = [
+            (row["Element"], float(faraday_angle_deg if link_rotation and row["Element"] == "Faraday rotator"
+                                   else row["Angle (°)"] or 0.0))
+            for row in edited_elements if row.get("Element") in ELEMENT_TYPES
+        ]
+        
+        # One chain per session: only the products from the first edited
+        # element onwards are recomputed on a rerun
+        if "optical_chain" not in st.session_state:
+            st.session_state.optical_chain = OpticalChain()
+        chain = st.session_state.optical_chain
+        chain.set_elements(chain_elements)
+        
+        if len(chain) == 0:
+            st.info("👈 Add at least one element to the chain")
+        else:
+            with stage("optical chain"):
+                input_angles = np.linspace(0, 180, 361)
+                inputs = jones_vector(input_angles)
+                forward_out = chain.evaluate(inputs, "forward")
+                recomputed = chain.recomputed
+                forward_t = intensity(forward_out)
+                backward_t = intensity(chain.evaluate(inputs, "backward"))
+                # Forward output sent straight back, as from a stray reflection
+                returned_t = intensity(chain.evaluate(forward_out, "backward"))
+            
+            # First of the (numerically) best inputs, so lossless chains report 0°
+            best = int(np.argmax(np.round(forward_t, 9)))
+            col_a, col_b, col_c = st.columns(3)
+            with col_a:
+                st.metric("Best Forward Transmission", f"{forward_t[best] * 100:.1f}%", f"input at {input_angles[best]:.1f}°", delta_color="off")
+            with col_b:
+                st.metric("Isolation", f"{isolation_db(forward_t[best], returned_t[best]):.1f} dB",
+                          help="Forward transmission over the share of it that makes it back out")
+            with col_c:
+                st.metric("Products Recomputed", f"{recomputed} / {len(chain)}")
+            
+            chart_data = {
+                "input angle (°)": input_angles,
+                "Forward": forward_t,
+                "Backward": backward_t,
+                "Forward, then back": returned_t,
+            }
+            if chain.elements[-1][0] == "Mirror":
+                double_pass_out = chain.evaluate(inputs, "double pass")
+                chart_data["Double pass"] = intensity(double_pass_out)
+                # Overlap with the input: 0 means the light returns orthogonal
+                chart_data["Double pass ⟨in|out⟩²"] = np.abs(np.sum(inputs.conj() * double_pass_out, axis=-1)) ** 2
+            st.markdown("**Transmitted intensity for linear input polarizations:**")
+            st.line_chart(chart_data, x="input angle (°)", height=300)
+            
+            forward_matrix = chain.matrix("forward")
+            st.markdown("**Forward Jones matrix:**")
+            st.dataframe({
+                "Ex in": [f"{forward_matrix[0, 0]:.4f}", f"{forward_matrix[1, 0]:.4f}"],
+                "Ey in": [f"{forward_matrix[0, 1]:.4f}", f"{forward_matrix[1, 1]:.4f}"],
+            }, use_container_width=True)
 
-with tab4:
+
+with tab3:
+    faraday_tab()
+
+@tab_fragment("BB84 Protocol")
+def bb84_tab():
     st.markdown('<p class="section-header">BB84 Quantum Key Distribution</p>', unsafe_allow_html=True)
     
     # Hero section
@@ -1038,21 +1295,383 @@ with tab4:
             🧪 Ready to Experience BB84 in Action?
         </h2>
         <p style='font-size: 1.2rem; margin-bottom: 2rem; opacity: 0.95;'>
-            Try our interactive BB84 simulator and see quantum key distribution working in real-time!
+            Run the built-in BB84 simulator below - it works offline and handles millions of qubits!
         </p>
     </div>
     """, unsafe_allow_html=True)
     
-    # Center the button
-    col1, col2, col3 = st.columns([1, 2, 1])
+    # Simulation lab
+    st.markdown('<p class="section-header">BB84 Simulation Lab</p>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.markdown("### 🎛️ Protocol Settings")
+        
+        bb84_qubits = st.select_slider(
+            "**Qubits sent by Alice:**",
+            options=[1_000, 10_000, 100_000, 1_000_000, 10_000_000, 50_000_000, 100_000_000],
+            value=100_000,
+            format_func=lambda n: f"{n:,}",
+            key="bb84_qubits"
+        )
+        
+        bb84_sample = st.slider(
+            "**Fraction of sifted bits sacrificed for error checking:**",
+            min_value=0.01,
+            max_value=0.5,
+            value=0.1,
+            step=0.01,
+            key="bb84_sample"
+        )
+        
+        bb84_eve = st.slider(
+            "**Eve's interception fraction (intercept-resend):**",
+            min_value=0.0,
+            max_value=1.0,
+            value=0.0,
+            step=0.05,
+            key="bb84_eve",
+            help="Eve measures this fraction of photons in a random basis and re-sends them"
+        )
+        
+        bb84_seed = st.number_input("**Random seed (0 = fresh randomness):**", min_value=0, value=0, step=1, key="bb84_seed")
+        
+        bb84_postprocess = st.checkbox(
+            "🧹 Post-process key (Cascade + privacy amplification)",
+            value=True,
+            key="bb84_postprocess",
+            help="Reconcile Bob's key with Cascade, then compress it with a Toeplitz hash"
+        )
+        
+        run_bb84_button = st.button("🔐 Run BB84", use_container_width=True, key="run_bb84")
+    
     with col2:
+        st.markdown("### 📊 Protocol Results")
+        
+        bb84_inputs = (bb84_qubits, bb84_sample, bb84_eve, bb84_seed, bb84_postprocess)
+        
+        def show_protocol_metrics(update):
+            col_a, col_b, col_c = st.columns(3)
+            with col_a:
+                st.metric("Sifted Key", f"{update['sifted_length']:,}",
+                          f"{update['sifted_length'] / update['qubits_sent'] * 100:.1f}% kept")
+            with col_b:
+                st.metric("QBER", f"{update['qber'] * 100:.2f}%")
+            with col_c:
+                st.metric("Final Key", f"{update['key_length']:,} bits")
+            
+            col_d, col_e, col_f = st.columns(3)
+            with col_d:
+                st.metric("Qubits Sent", f"{update['qubits_sent']:,}")
+            with col_e:
+                st.metric("Throughput", f"{update['qubits_per_second'] / 1e6:.1f} M qubits/s")
+            with col_f:
+                st.metric("Intercepted by Eve", f"{update['intercepted']:,}")
+            
+            if update['aborted']:
+                st.caption("🚨 Running QBER is above the 11% abort threshold")
+            else:
+                st.caption("🟢 Running QBER is within the 11% abort threshold")
+        
+        if run_bb84_button:
+            from bb84 import BASIS_SYMBOLS, bb84_stream
+            from bb84_postprocess import MAX_KEY_BITS, postprocess_key
+            
+            progress_bar = st.progress(0)
+            live_metrics = st.empty()
+            qber_chart = st.empty()
+            qber_history = []
+            alice_raw, bob_raw, raw_bits = [], [], 0
+            
+            # The protocol runs chunk by chunk; the metrics update after each one
+            for update in bb84_stream(bb84_qubits, sample_fraction=bb84_sample,
+                                      eve_fraction=bb84_eve, seed=bb84_seed or None):
+                if update['chunk_index'] == 0:
+                    first_chunk = update['chunk']
+                if bb84_postprocess and raw_bits < MAX_KEY_BITS:
+                    take = slice(0, MAX_KEY_BITS - raw_bits)
+                    alice_raw.append(update['chunk']['alice_key_bits'][take])
+                    bob_raw.append(update['chunk']['bob_key_bits'][take])
+                    raw_bits += alice_raw[-1].size
+                qber_history.append(update['qber'] * 100)
+                
+                with live_metrics.container():
+                    show_protocol_metrics(update)
+                
+                if len(qber_history) > 1:
+                    qber_chart.line_chart({"Running QBER (%)": qber_history}, height=200)
+                progress_bar.progress(update['qubits_sent'] / update['num_qubits'])
+            
+            progress_bar.empty()
+            
+            post = None
+            if bb84_postprocess and not update['aborted'] and raw_bits:
+                with st.spinner("🧹 Reconciling and amplifying privacy..."):
+                    post = postprocess_key(np.packbits(np.concatenate(alice_raw)), np.packbits(np.concatenate(bob_raw)),
+                                           raw_bits, update['qber'], seed=bb84_seed or None)
+                # The distilled keys themselves are not displayed
+                post = {name: value for name, value in post.items() if not name.endswith("_final_key")}
+            
+            # Only what the page shows is kept, not the chunk arrays
+            preview = slice(0, 16)
+            store_result("bb84", bb84_inputs, {
+                "update": {name: value for name, value in update.items() if name != 'chunk'},
+                "qber_history": qber_history,
+                "raw_bits": raw_bits,
+                "post": post,
+                "preview": {
+                    "Alice bit": first_chunk['alice_bits'][preview],
+                    "Alice basis": BASIS_SYMBOLS[first_chunk['alice_bases'][preview]],
+                    "Bob basis": BASIS_SYMBOLS[first_chunk['bob_bases'][preview]],
+                    "Bob result": first_chunk['bob_results'][preview],
+                    "Kept": np.where(first_chunk['kept'][preview], "✅", "❌")
+                },
+                "key_hex": np.packbits(first_chunk['alice_key_bits'][:256]).tobytes().hex(),
+            })
+        
+        # Shown until any protocol setting changes
+        bb84_result = last_result("bb84", bb84_inputs)
+        if bb84_result is not None:
+            update, post, raw_bits = bb84_result['update'], bb84_result['post'], bb84_result['raw_bits']
+            
+            if not run_bb84_button:
+                show_protocol_metrics(update)
+                if len(bb84_result['qber_history']) > 1:
+                    st.line_chart({"Running QBER (%)": bb84_result['qber_history']}, height=200)
+            
+            if update['aborted']:
+                st.error("🚨 QBER above the 11% threshold - eavesdropper detected, key discarded!")
+            else:
+                st.success(f"✅ Alice and Bob share a {update['key_length']:,}-bit secret key!")
+            
+            if post is not None:
+                st.markdown("**Post-processing:**")
+                col_g, col_h, col_i = st.columns(3)
+                with col_g:
+                    st.metric("Parity Bits Leaked", f"{post['leaked_bits']:,}",
+                              f"{post['leaked_bits'] / raw_bits * 100:.1f}% of raw key", delta_color="off")
+                with col_h:
+                    st.metric("Errors After Cascade", f"{post['residual_errors']:,}")
+                with col_i:
+                    st.metric("Secret Key", f"{post['final_length']:,} bits",
+                              f"{post['final_length'] / raw_bits * 100:.1f}% of raw key", delta_color="off")
+                
+                st.dataframe({
+                    "Step": ["Cascade error correction", "Toeplitz privacy amplification"],
+                    "Time (ms)": [f"{post['ec_seconds'] * 1e3:.1f}", f"{post['pa_seconds'] * 1e3:.1f}"],
+                    "Throughput (M bits/s)": [f"{post['ec_bits_per_second'] / 1e6:.2f}",
+                                              f"{post['pa_bits_per_second'] / 1e6:.2f}"],
+                }, use_container_width=True, hide_index=True)
+                
+                if raw_bits < update['key_length']:
+                    st.caption(f"Post-processing ran on the first {raw_bits:,} raw key bits.")
+                if post['final_length'] == 0:
+                    st.warning("⚠️ Reconciliation leaked too much information - no secret key survives privacy amplification.")
+                elif post['keys_match']:
+                    st.success(f"✅ Reconciled keys agree - {post['final_length']:,}-bit secret key distilled!")
+                else:
+                    st.error("❌ Residual errors survived Cascade - the distilled keys differ.")
+            
+            st.markdown("**First 16 qubits:**")
+            st.dataframe(bb84_result['preview'], use_container_width=True)
+            
+            st.markdown("**Key preview (hex, first 32 bytes):**")
+            st.code(bb84_result['key_hex'], language='text')
+        
+        else:
+            st.info("👆 Choose the protocol settings and click 'Run BB84'")
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown('<p class="section-header">Monte Carlo Sweep</p>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.markdown("### 🎛️ Sweep Grid")
+        
+        sweep_distance = st.slider("**Fiber distance (km):**", min_value=0, max_value=200, value=(0, 100), step=5, key="sweep_distance")
+        sweep_points = st.slider("**Distance points:**", min_value=2, max_value=25, value=8, key="sweep_points")
+        
+        sweep_efficiency = st.multiselect(
+            "**Detector efficiency:**",
+            options=[0.1, 0.2, 0.5, 0.9],
+            default=[0.2],
+            format_func=lambda eta: f"{eta:.0%}",
+            key="sweep_efficiency"
+        )
+        
+        sweep_dark = st.multiselect(
+            "**Dark-count probability (per detector, per pulse):**",
+            options=[1e-7, 1e-6, 1e-5, 1e-4],
+            default=[1e-5],
+            format_func=lambda p: f"{p:.0e}",
+            key="sweep_dark"
+        )
+        
+        sweep_eve = st.multiselect(
+            "**Eve's interception fraction:**",
+            options=[0.0, 0.1, 0.25, 0.5],
+            default=[0.0, 0.25],
+            format_func=lambda f: f"{f:.0%}",
+            key="sweep_eve"
+        )
+        
+        sweep_qubits = st.select_slider(
+            "**Qubits per run:**",
+            options=[10_000, 100_000, 1_000_000],
+            value=100_000,
+            format_func=lambda n: f"{n:,}",
+            key="sweep_qubits"
+        )
+        sweep_repeats = st.slider("**Independent runs per point:**", min_value=2, max_value=32, value=8, key="sweep_repeats")
+        sweep_seed = st.number_input("**Sweep seed:**", min_value=0, value=1, step=1, key="sweep_seed")
+        
+        run_sweep_button = st.button("📈 Run Sweep", use_container_width=True, key="run_sweep")
+    
+    with col2:
+        st.markdown("### 📊 Key Rate & QBER")
+        
+        sweep_inputs = (sweep_distance, sweep_points, tuple(sweep_efficiency), tuple(sweep_dark), tuple(sweep_eve),
+                        sweep_qubits, sweep_repeats, sweep_seed)
+        distances = np.linspace(sweep_distance[0], sweep_distance[1], sweep_points)
+        
+        if run_sweep_button and not (sweep_efficiency and sweep_dark and sweep_eve):
+            st.warning("⚠️ Pick at least one detector efficiency, dark-count probability and interception fraction.")
+        elif run_sweep_button:
+            from bb84_sweep import run_sweep, sweep_grid
+            
+            grid = sweep_grid(distances, sweep_efficiency, sweep_dark, sweep_eve)
+            
+            progress_bar = st.progress(0)
+            store_result("sweep", sweep_inputs, run_sweep(
+                grid, num_qubits=sweep_qubits, repeats=sweep_repeats, seed=sweep_seed,
+                progress=lambda done, total: progress_bar.progress(done / total)
+            ))
+            progress_bar.empty()
+        
+        # Shown until the grid or run settings change
+        sweep = last_result("sweep", sweep_inputs)
+        if sweep is not None:
+            from matplotlib.figure import Figure
+            
+            st.caption(f"{sweep['runs']:,} protocol runs on {sweep['workers']} worker processes in "
+                       f"{sweep['elapsed']:.2f} s ({sweep['qubits_per_second'] / 1e6:.1f} M qubits/s)")
+            
+            # One curve per (efficiency, dark count, Eve) combination, shaded by its 95% CI
+            fig = Figure(figsize=(10, 8))
+            rate_ax, qber_ax = fig.subplots(2, 1, sharex=True)
+            for efficiency in sweep_efficiency:
+                for dark in sweep_dark:
+                    for eve in sweep_eve:
+                        rows = [row for row in sweep['rows']
+                                if (row['detector_efficiency'], row['dark_count_prob'], row['eve_fraction']) == (efficiency, dark, eve)]
+                        rate = np.array([row['key_rate'] for row in rows])
+                        rate_ci = np.array([row['key_rate_ci'] for row in rows])
+                        qber = np.array([row['qber'] for row in rows]) * 100
+                        qber_ci = np.array([row['qber_ci'] for row in rows]) * 100
+                        
+                        label = f"η={efficiency:.0%}, dark={dark:.0e}, Eve={eve:.0%}"
+                        line, = rate_ax.plot(distances, rate, 'o-', markersize=3, label=label)
+                        rate_ax.fill_between(distances, np.maximum(rate - rate_ci, 1e-9), rate + rate_ci,
+                                             color=line.get_color(), alpha=0.2)
+                        qber_ax.plot(distances, qber, 'o-', markersize=3, color=line.get_color())
+                        qber_ax.fill_between(distances, np.maximum(qber - qber_ci, 0), qber + qber_ci,
+                                             color=line.get_color(), alpha=0.2)
+            
+            rate_ax.set_yscale('log')
+            rate_ax.set_ylabel('Secret key rate (bits / qubit sent)')
+            rate_ax.legend(fontsize=8)
+            rate_ax.grid(True, alpha=0.3)
+            qber_ax.axhline(11, color='red', linestyle='--', linewidth=1, label='11% abort threshold')
+            qber_ax.set_xlabel('Fiber distance (km)')
+            qber_ax.set_ylabel('QBER (%)')
+            qber_ax.legend(fontsize=8)
+            qber_ax.grid(True, alpha=0.3)
+            fig.tight_layout()
+            st.pyplot(fig)
+            
+            with st.expander("🔢 Sweep data"):
+                st.dataframe(sweep['rows'], use_container_width=True)
+        
+        elif not run_sweep_button:
+            st.info("👆 Choose a parameter grid and click 'Run Sweep'")
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown('<p class="section-header">Decoherence-Free Subspace BB84</p>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.markdown("### 🛡️ Collective Noise")
+        
+        dfs_qubits = st.select_slider(
+            "**Logical qubits sent:**",
+            options=[100_000, 1_000_000, 5_000_000, 10_000_000],
+            value=1_000_000,
+            format_func=lambda n: f"{n:,}",
+            key="dfs_qubits"
+        )
+        dfs_collective = st.slider(
+            "**Collective phase drift σ (degrees):**",
+            min_value=0, max_value=180, value=60, step=5,
+            key="dfs_collective",
+            help="Random polarization rotation shared by both photons of a pair"
+        )
+        dfs_independent = st.slider(
+            "**Independent phase noise σ (degrees):**",
+            min_value=0, max_value=45, value=5, step=1,
+            key="dfs_independent",
+            help="Per-photon rotation on top of the shared drift - the DFS cannot cancel this part"
+        )
+        dfs_seed = st.number_input("**Random seed (0 = fresh randomness):**", min_value=0, value=0, step=1, key="dfs_seed")
+        
         st.markdown("""
-            <a href="https://bb84.srijan.dpdns.org/" target="_blank" style="text-decoration: none;">
-                <button class="custom-link-button">
-                    🚀 ENTER THE SIMULATION LAB
-                </button>
-            </a>
+        <div class="info-box">
+        <h4>🧩 Encoding</h4>
+        <p>|0<sub>L</sub>⟩ = |01⟩, |1<sub>L</sub>⟩ = |10⟩. A shared rotation multiplies both terms by the same phase, 
+        so every logical BB84 state passes through unchanged - at the cost of two photons per key bit.</p>
+        </div>
         """, unsafe_allow_html=True)
+        
+        run_dfs_button = st.button("🛡️ Compare Encodings", use_container_width=True, key="run_dfs")
+    
+    with col2:
+        st.markdown("### 📊 Unencoded vs DFS")
+        
+        from dfs_bb84 import compare_dfs, expected_qber
+        
+        dfs_inputs = (dfs_qubits, dfs_collective, dfs_independent, dfs_seed)
+        collective_sigma, independent_sigma = np.deg2rad(dfs_collective), np.deg2rad(dfs_independent)
+        if run_dfs_button:
+            with st.spinner("📡 Sending logical qubits through the collective-noise channel..."):
+                store_result("dfs", dfs_inputs, compare_dfs(dfs_qubits, collective_sigma, independent_sigma, seed=dfs_seed or None))
+        
+        # Shown until the channel settings change
+        comparison = last_result("dfs", dfs_inputs)
+        if comparison is not None:
+            for name, column in zip(comparison, st.columns(2)):
+                result = comparison[name]
+                with column:
+                    st.markdown(f"**{name}**")
+                    st.metric("QBER", f"{result['qber'] * 100:.2f}%",
+                              f"expected {expected_qber(collective_sigma, independent_sigma, name == 'DFS') * 100:.2f}%",
+                              delta_color="off")
+                    st.metric("Secret Key Rate", f"{result['key_rate']:.4f} bits/photon")
+                    st.metric("Photons Sent", f"{result['physical_qubits']:,}")
+                    st.caption(f"{result['logical_qubits_per_second'] / 1e6:.1f} M logical qubits/s")
+                    if result['aborted']:
+                        st.error("🚨 QBER above 11% - key discarded")
+                    else:
+                        st.success(f"✅ {result['key_length']:,}-bit raw key")
+            
+            st.bar_chart({
+                "QBER (%)": {name: result['qber'] * 100 for name, result in comparison.items()},
+                "Key rate (×100 bits/photon)": {name: result['key_rate'] * 100 for name, result in comparison.items()},
+            }, height=260, stack=False)
+        
+        else:
+            st.info("👆 Set the channel noise and click 'Compare Encodings'")
     
     st.markdown("<br><br>", unsafe_allow_html=True)
     
@@ -1077,7 +1696,235 @@ with tab4:
         - **2023:** Record-breaking QKD distances achieved with trusted node networks
         """)
 
+
+with tab4:
+    bb84_tab()
+
+@tab_fragment("Circuit Builder")
+def circuit_builder_tab():
+    from statevector import COMPARE_MAX_QUBITS, GATE_NAMES, MAX_QUBITS, ROTATION_GATES, TWO_QUBIT_GATES, format_bytes
+    
+    st.markdown('<p class="section-header">Multi-Qubit Circuit Builder</p>', unsafe_allow_html=True)
+    
+    if "circuit_ops" not in st.session_state:
+        st.session_state.circuit_ops = []
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.markdown("### 🧱 Build Your Circuit")
+        
+        circuit_qubits = st.slider("**Number of qubits:**", min_value=1, max_value=MAX_QUBITS, value=3, key="circuit_qubits")
+        st.caption(f"State vector: {format_bytes(16 * 2 ** circuit_qubits)} of complex128 amplitudes")
+        
+        st.markdown("---")
+        
+        available_gates = GATE_NAMES if circuit_qubits > 1 else [g for g in GATE_NAMES if g not in TWO_QUBIT_GATES]
+        circuit_gate = st.selectbox("**Gate:**", available_gates, key="circuit_gate")
+        
+        qubit_options = list(range(circuit_qubits))
+        if circuit_gate in TWO_QUBIT_GATES:
+            first_label, second_label = ("Control qubit", "Target qubit") if circuit_gate == "CNOT" else ("First qubit", "Second qubit")
+            first_qubit = st.selectbox(f"**{first_label}:**", qubit_options, format_func=lambda q: f"q{q}", key="circuit_first")
+            second_qubit = st.selectbox(f"**{second_label}:**", [q for q in qubit_options if q != first_qubit],
+                                        format_func=lambda q: f"q{q}", key="circuit_second")
+            gate_qubits = (first_qubit, second_qubit)
+        else:
+            gate_qubits = (st.selectbox("**Qubit:**", qubit_options, format_func=lambda q: f"q{q}", key="circuit_first"),)
+        
+        gate_angle = None
+        if circuit_gate in ROTATION_GATES:
+            gate_angle = float(np.deg2rad(st.slider("**Rotation Angle (degrees):**", 0, 360, 90, step=15, key="circuit_angle")))
+        
+        if st.button("➕ Add Gate", use_container_width=True, key="circuit_add"):
+            st.session_state.circuit_ops.append((circuit_gate, gate_qubits, gate_angle))
+        
+        col_a, col_b, col_c = st.columns(3)
+        with col_a:
+            if st.button("↩️ Undo", use_container_width=True, key="circuit_undo") and st.session_state.circuit_ops:
+                st.session_state.circuit_ops.pop()
+        with col_b:
+            if st.button("🗑️ Clear", use_container_width=True, key="circuit_clear"):
+                st.session_state.circuit_ops = []
+        with col_c:
+            if st.button("✨ GHZ", use_container_width=True, key="circuit_ghz", help="H on q0, then a CNOT chain over every qubit"):
+                st.session_state.circuit_ops = [("H", (0,), None)] + [
+                    ("CNOT", (q, q + 1), None) for q in range(circuit_qubits - 1)
+                ]
+        
+        st.markdown("---")
+        
+        fuse_circuit = st.checkbox("⚡ Fuse single-qubit gates", value=True, key="circuit_fuse",
+                                   help="Multiply runs of single-qubit gates on a wire into one unitary and cancel inverse pairs")
+        # A second run needs a second state, so it is opt-in and only for
+        # registers small enough that the extra memory does not matter
+        compare_unfused = fuse_circuit and circuit_qubits <= COMPARE_MAX_QUBITS and st.checkbox(
+            "⏱️ Also time the unfused circuit", value=False, key="circuit_compare",
+            help=f"Runs the circuit a second time without fusion; up to {COMPARE_MAX_QUBITS} qubits"
+        )
+        
+        run_circuit = st.button("▶️ Run Circuit", use_container_width=True, key="run_circuit")
+    
+    with col2:
+        st.markdown("### 📋 Circuit")
+        
+        # Gates on qubits that no longer exist (after shrinking the register) are skipped
+        circuit_ops = [op for op in st.session_state.circuit_ops if max(op[1]) < circuit_qubits]
+        skipped = len(st.session_state.circuit_ops) - len(circuit_ops)
+        
+        def describe(op):
+            name, qubits, angle = op
+            label = f"{name}({np.rad2deg(angle):.0f}°)" if angle is not None else name
+            return f"{label} " + ("→".join if name == "CNOT" else ", ".join)(f"q{q}" for q in qubits)
+        
+        if circuit_ops:
+            st.code("\n".join(f"{i + 1:>3}. {describe(op)}" for i, op in enumerate(circuit_ops)), language='text')
+        else:
+            st.info("👈 Add gates to build a circuit - every qubit starts in |0⟩")
+        if skipped:
+            st.caption(f"⚠️ {skipped} gate(s) act on qubits beyond q{circuit_qubits - 1} and are skipped.")
+        
+        circuit_inputs = (circuit_qubits, tuple(circuit_ops), fuse_circuit, compare_unfused)
+        if run_circuit:
+            from statevector import qubit_probabilities, simulate_circuit, top_outcomes
+            
+            with st.spinner(f"Simulating {circuit_qubits} qubits..."):
+                result = simulate_circuit(circuit_qubits, circuit_ops, fuse=fuse_circuit)
+                # The state can be ~1 GiB, so only what the page shows is kept
+                state = result.pop('state')
+                result['outcomes'] = [(index, state[index], p) for index, p in top_outcomes(state, k=16)]
+                result['probabilities'] = qubit_probabilities(state)
+                del state
+                # Only run after the fused state is freed, so the two never coexist
+                result['baseline_elapsed'] = simulate_circuit(circuit_qubits, circuit_ops)['elapsed'] if compare_unfused else None
+            store_result("circuit", circuit_inputs, result)
+        
+        # Shown until the register, the gate list or the fusion settings change
+        result = last_result("circuit", circuit_inputs)
+        if result is not None:
+            outcomes, probabilities, baseline_elapsed = result['outcomes'], result['probabilities'], result['baseline_elapsed']
+            
+            st.markdown("### 📊 Results")
+            col_d, col_e, col_f = st.columns(3)
+            with col_d:
+                st.metric("Gates Simulated", result['gates_simulated'],
+                          f"{result['gate_count'] - result['gates_simulated']} fused away" if fuse_circuit else None,
+                          delta_arrow="off")
+            with col_e:
+                st.metric("Run Time", f"{result['elapsed'] * 1e3:.1f} ms",
+                          f"{(result['elapsed'] - baseline_elapsed) * 1e3:+.1f} ms vs unfused" if baseline_elapsed is not None else None,
+                          delta_color="inverse")
+            with col_f:
+                st.metric("Memory", format_bytes(result['memory_bytes']),
+                          f"state {format_bytes(result['state_bytes'])}", delta_color="off")
+            
+            if fuse_circuit:
+                st.caption(f"Fusion pass: {result['gate_count']} → {result['gates_simulated']} gates "
+                           f"in {result['fusion_seconds'] * 1e3:.2f} ms (included in the run time)")
+            
+            st.markdown("**Most likely basis states:**")
+            st.dataframe({
+                "Basis state": [f"|{index:0{circuit_qubits}b}⟩" for index, _, _ in outcomes],
+                "Amplitude": [f"{amplitude:.4f}" for _, amplitude, _ in outcomes],
+                "Probability": [round(p, 6) for _, _, p in outcomes],
+            }, use_container_width=True, hide_index=True)
+            
+            st.markdown("**Probability of measuring 1 on each qubit:**")
+            st.bar_chart({"P(1)": {f"q{q}": p for q, p in enumerate(probabilities)}}, height=220)
+            
+            if circuit_ops and circuit_qubits <= 12:
+                from statevector import build_multi_qubit_circuit, fuse_gates
+                st.markdown("**Circuit diagram:**")
+                st.code(str(build_multi_qubit_circuit(circuit_qubits, circuit_ops).draw(output='text')), language='text')
+                if fuse_circuit:
+                    st.markdown("**After fusion:**")
+                    st.code(str(build_multi_qubit_circuit(circuit_qubits, fuse_gates(circuit_ops)).draw(output='text')), language='text')
+
+
 with tab5:
+    circuit_builder_tab()
+
+@tab_fragment("Noise Channels")
+def noise_tab():
+    from noise import CHANNELS, noise_sweep
+    
+    st.markdown('<p class="section-header">Mixed States & Noise Channels</p>', unsafe_allow_html=True)
+    
+    channel_descriptions = {
+        "Depolarizing": "With probability p the qubit is replaced by the maximally mixed state I/2 - the Bloch vector shrinks uniformly towards the centre.",
+        "Amplitude damping": "Energy relaxation (T1): |1⟩ decays to |0⟩ with probability γ, pulling the Bloch vector towards the north pole.",
+        "Phase damping": "Pure dephasing (T2): populations are kept but coherences fade, collapsing the vector onto the Z axis.",
+        "Collective dephasing": "All qubits share the same random phase flip. On one qubit it dephases like a Z error, but the two-qubit |01⟩/|10⟩ subspace is immune to it.",
+    }
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.markdown("### 🎛️ Noise Controls")
+        
+        noise_state = st.selectbox("**Initial State:**", ["|0⟩", "|1⟩", "|+⟩", "|-⟩"], index=2, key="noise_state")
+        noise_channel = st.selectbox("**Noise Channel:**", CHANNELS, key="noise_channel")
+        noise_strength = st.slider("**Noise strength:**", min_value=0.0, max_value=1.0, value=0.3, step=0.01, key="noise_strength")
+        sweep_resolution = st.select_slider("**Sweep points:**", options=[101, 251, 501, 1001], value=501, key="noise_points")
+        
+        st.markdown(f"""
+        <div class="info-box">
+        <h4>🌫️ {noise_channel}</h4>
+        <p>{channel_descriptions[noise_channel]}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("### 📊 Noisy State")
+        
+        import time
+        
+        # The whole strength range is one batched channel application, so the
+        # curves and the selected point update on every slider move
+        started = time.perf_counter()
+        sweep = noise_sweep(noise_state, noise_channel, np.linspace(0, 1, sweep_resolution))
+        sweep_ms = (time.perf_counter() - started) * 1e3
+        current = noise_sweep(noise_state, noise_channel, [noise_strength])
+        rho, vector = current['rho'][0], current['bloch'][0]
+        
+        col_a, col_b, col_c = st.columns(3)
+        with col_a:
+            st.metric("Purity Tr(ρ²)", f"{current['purity'][0]:.4f}")
+        with col_b:
+            st.metric("Fidelity ⟨ψ|ρ|ψ⟩", f"{current['fidelity'][0]:.4f}")
+        with col_c:
+            st.metric("Bloch Length |r|", f"{np.linalg.norm(vector):.4f}")
+        
+        col_d, col_e = st.columns(2)
+        with col_d:
+            if interactive_bloch:
+                bloch_sphere(vectors=vector, height=360, key="noise_bloch")
+            else:
+                st.image(bloch_vector_png(vector), use_container_width=True)
+        with col_e:
+            st.markdown("**Density matrix ρ:**")
+            st.dataframe({
+                "|0⟩": [f"{rho[0, 0]:.4f}", f"{rho[1, 0]:.4f}"],
+                "|1⟩": [f"{rho[0, 1]:.4f}", f"{rho[1, 1]:.4f}"],
+            }, use_container_width=True)
+            st.markdown(f"**Bloch vector:** ({vector[0]:.3f}, {vector[1]:.3f}, {vector[2]:.3f})")
+        
+        st.markdown("**Bloch components and purity across the whole strength range:**")
+        st.line_chart({
+            "strength": sweep['strengths'],
+            "x": sweep['bloch'][:, 0],
+            "y": sweep['bloch'][:, 1],
+            "z": sweep['bloch'][:, 2],
+            "purity": sweep['purity'],
+        }, x="strength", height=280)
+        st.caption(f"{sweep_resolution} noise strengths swept in {sweep_ms:.2f} ms (one einsum per channel)")
+
+
+with tab6:
+    noise_tab()
+
+@tab_fragment("About Us")
+def about_tab():
     st.markdown('<p class="section-header">Meet The Team</p>', unsafe_allow_html=True)
     st.markdown("<p class='subtitle'>The innovators dedicated to making quantum concepts accessible to all.</p>", unsafe_allow_html=True)
 
@@ -1085,9 +1932,9 @@ with tab5:
     col1, col2, col3 = st.columns(3, gap="large")
 
     with col1:
-        st.markdown("""
+        st.markdown(f"""
         <div class="profile-card">
-            <img src="https://github.com/ivanho-git/qubit-gates/blob/main/abhinav.jpeg?raw=true" class="profile-img">
+            {profile_picture("abhinav.jpeg", "Abhinav Suneesh")}
             <p class="profile-name">ABHINAV SUNEESH</p>
             <p class="profile-role">BB84 in DFS Researcher</p>
             <p class="profile-role">25BCE5100</p>
@@ -1098,9 +1945,9 @@ with tab5:
         """, unsafe_allow_html=True)
 
     with col2:
-        st.markdown("""
+        st.markdown(f"""
         <div class="profile-card">
-            <img src="https://github.com/ivanho-git/qubit-gates/blob/main/WhatsApp%20Image%202025-11-10%20at%2010.34.58%20AM.jpeg?raw=true" class="profile-img">
+            {profile_picture("WhatsApp Image 2025-11-10 at 10.34.58 AM.jpeg", "Ibhan Mukherjee")}
             <p class="profile-name">IBHAN MUKHERJEE</p>
             <p class="profile-role">The Eve Hunter</p>
             <p class="profile-role">25BCE5182</p>
@@ -1111,9 +1958,9 @@ with tab5:
         """, unsafe_allow_html=True)
 
     with col3:
-        st.markdown("""
+        st.markdown(f"""
         <div class="profile-card">
-            <img src="https://github.com/ivanho-git/qubit-gates/blob/main/IMG-20251106-WA0032.jpg?raw=true" class="profile-img">
+            {profile_picture("IMG-20251106-WA0032.jpg", "Hari Ashwin")}
             <p class="profile-name">HARI ASHWIN</p>
             <p class="profile-role">Qubits and Gates Expert</p>
             <p class="profile-role">25BCE5107</p>
@@ -1129,9 +1976,9 @@ with tab5:
     _, col4, col5, _ = st.columns([0.5, 1, 1, 0.5], gap="large")
 
     with col4:
-        st.markdown("""
+        st.markdown(f"""
         <div class="profile-card">
-            <img src="https://github.com/ivanho-git/qubit-gates/blob/main/srijan.jpg?raw=true" class="profile-img">
+            {profile_picture("srijan.jpg", "Srijan Guchhait")}
             <p class="profile-name">SRIJAN GUCHHAIT</p>
             <p class="profile-role">BB84 Idealist</p>
             <p class="profile-role">25BCE5104</p>
@@ -1142,9 +1989,9 @@ with tab5:
         """, unsafe_allow_html=True)
 
     with col5:
-        st.markdown("""
+        st.markdown(f"""
         <div class="profile-card">
-            <img src="https://github.com/ivanho-git/qubit-gates/blob/main/IMG-20251106-WA0008.jpg?raw=true" class="profile-img">
+            {profile_picture("IMG-20251106-WA0008.jpg", "Om Thavari")}
             <p class="profile-name">OM THAVARI</p>
             <p class="profile-role">Faraday Rotator Technician</p>
             <p class="profile-role">25BCE5180</p>
@@ -1163,3 +2010,12 @@ st.markdown("""
         <p style='font-size: 0.9rem; opacity: 0.8;'>Visualizing quantum states on the Bloch sphere | Ibhan Mukherjee</p>
     </div>
 """, unsafe_allow_html=True)
+
+
+with tab7:
+    about_tab()
+
+# Drawn after the tabs so it includes their timings from this run
+if st.session_state.get("debug_latency"):
+    with st.sidebar:
+        latency_panel()
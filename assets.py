@@ -0,0 +1,143 @@
+import functools
+import hashlib
+import json
+from pathlib import Path
+
+# Asset pipeline for the About Us tab. Team photos in the repo root become
+# square 150px thumbnails (the size of .profile-img) in AVIF and WebP, written
+# to static/ under content-hashed names so their URLs never change meaning
+# and can be cached indefinitely. Streamlit serves static/ at app/static/
+# (server.enableStaticServing in .streamlit/config.toml). Rebuild with:
+#   python assets.py
+
+ROOT = Path(__file__).parent
+STATIC_DIR = ROOT / "static"
+THUMBNAIL_DIR = STATIC_DIR / "team"
+FONT_DIR = STATIC_DIR / "fonts"
+MANIFEST_PATH = STATIC_DIR / "manifest.json"
+
+# Relative URL of static/ as seen from the page
+STATIC_URL = "app/static"
+
+THUMBNAIL_SIZE = 150
+
+# Encoder settings per format, best compression first: browsers take the
+# first <source> they support
+THUMBNAIL_FORMATS = {
+    "avif": {"quality": 55, "speed": 4},
+    "webp": {"quality": 80, "method": 6},
+}
+
+# Poppins weights used by the CSS, as self-hosted woff2 files in static/fonts/
+# (converted unmodified from the OFL release; license in static/fonts/OFL.txt)
+POPPINS_WEIGHTS = {300: "Light", 400: "Regular", 600: "SemiBold", 700: "Bold"}
+
+
+def source_images():
+    return sorted(path for pattern in ("*.jpg", "*.jpeg") for path in ROOT.glob(pattern))
+
+
+def square_thumbnail(path, size=THUMBNAIL_SIZE):
+    # Centre crop to a square, like object-fit: cover, then downscale
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as image:
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        return ImageOps.fit(image, (size, size), method=Image.Resampling.LANCZOS)
+
+
+def _fingerprint(path, size):
+    digest = hashlib.sha256(path.read_bytes())
+    digest.update(repr((size, THUMBNAIL_FORMATS)).encode())
+    return digest.hexdigest()[:10]
+
+
+def _slug(path):
+    return "".join(c if c.isalnum() else "-" for c in path.stem.lower()).strip("-")
+
+
+def build_thumbnails(sources=None, size=THUMBNAIL_SIZE):
+    # Writes every missing thumbnail, deletes ones no source maps to any
+    # more and rewrites the manifest: source file name -> {format: path
+    # relative to static/}
+    from PIL import features
+
+    formats = [name for name in THUMBNAIL_FORMATS if features.check(name)]
+    if not formats:
+        raise RuntimeError("Pillow was built without WebP and AVIF support")
+
+    THUMBNAIL_DIR.mkdir(parents=True, exist_ok=True)
+    manifest, keep = {}, set()
+    for path in sources or source_images():
+        stem = f"{_slug(path)}-{_fingerprint(path, size)}"
+        entry = {}
+        thumbnail = None
+        for name in formats:
+            target = THUMBNAIL_DIR / f"{stem}.{name}"
+            if not target.exists():
+                if thumbnail is None:
+                    thumbnail = square_thumbnail(path, size)
+                thumbnail.save(target, format=name.upper(), **THUMBNAIL_FORMATS[name])
+            entry[name] = target.relative_to(STATIC_DIR).as_posix()
+            keep.add(target)
+        manifest[path.name] = entry
+
+    for stale in THUMBNAIL_DIR.iterdir():
+        if stale not in keep:
+            stale.unlink()
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+    load_manifest.cache_clear()
+    return manifest
+
+
+@functools.lru_cache(maxsize=1)
+def load_manifest():
+    try:
+        return json.loads(MANIFEST_PATH.read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def profile_picture(source, alt=""):
+    # <picture> for a team photo: AVIF, then WebP. loading="lazy" defers the
+    # download until the card is rendered visible, i.e. until the About Us
+    # tab is opened.
+    entry = load_manifest().get(source)
+    if not entry:
+        raise KeyError(f"No thumbnail for {source!r}; run `python assets.py`")
+    sources = "".join(
+        f'<source srcset="{STATIC_URL}/{entry[name]}" type="image/{name}">'
+        for name in THUMBNAIL_FORMATS if name in entry
+    )
+    fallback = entry.get("webp") or next(iter(entry.values()))
+    return (
+        f'<picture>{sources}<img src="{STATIC_URL}/{fallback}" class="profile-img" alt="{alt}" '
+        f'width="{THUMBNAIL_SIZE}" height="{THUMBNAIL_SIZE}" loading="lazy" decoding="async"></picture>'
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def font_face_css():
+    # @font-face rules for Poppins: an installed copy first, then the woff2
+    # file in static/fonts/. Nothing is fetched from a third party; a weight
+    # without a file falls back to the system font stack in app.py.
+    rules = []
+    for weight, style in POPPINS_WEIGHTS.items():
+        font_file = FONT_DIR / f"poppins-{weight}.woff2"
+        if not font_file.exists():
+            continue
+        sources = [f"local('Poppins {style}')", f"local('Poppins-{style}')",
+                   f"url('{STATIC_URL}/fonts/{font_file.name}') format('woff2')"]
+        rules.append(
+            "@font-face { font-family: 'Poppins'; font-style: normal; "
+            f"font-weight: {weight}; font-display: swap; src: {', '.join(sources)}; }}"
+        )
+    return "\n".join(rules)
+
+
+if __name__ == "__main__":
+    manifest = build_thumbnails()
+    for source, entry in manifest.items():
+        original = (ROOT / source).stat().st_size
+        sizes = ", ".join(f"{name} {(STATIC_DIR / path).stat().st_size / 1024:.1f} KiB" for name, path in entry.items())
+        print(f"{source}: {original / 1024:.1f} KiB -> {sizes}")
@@ -0,0 +1,280 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from quantum_engine import (
+    GATES, INITIAL_STATES, POLARIZATION_ANGLES, ROTATION_AXES, bloch_vector, faraday_rotation, jones_vector,
+    rotate_each,
+)
+
+# Headless batch runner for the physics of the Standard Gates, Rotation Gates
+# and Faraday Rotator tabs. Reads one JSON job per line and writes one JSON
+# result per line, in input order:
+#
+#   {"id": "q1", "state": "|+⟩", "gate": "H"}
+#   {"id": "q2", "state": "0", "axis": "Y", "angle": 90}
+#   {"id": "q3", "polarization": "D", "verdet": 50, "B": 1.0, "L": 0.1}
+#
+#   python batch.py jobs.jsonl > results.jsonl
+#   cat jobs.jsonl | python batch.py --workers 4 --render bloch/
+#
+# Lines are handed to a process pool in chunks; inside a chunk the jobs are
+# grouped by type and simulated as whole arrays. A job that cannot be parsed
+# produces an {"id", "line", "error"} result instead of stopping the run.
+
+JOB_TYPES = ("gate", "rotation", "faraday")
+
+# Lines per task sent to a worker
+CHUNK_SIZE = 5000
+
+STATE_ALIASES = {"0": "|0⟩", "1": "|1⟩", "+": "|+⟩", "-": "|-⟩"}
+
+GATE_ALIASES = {
+    "I": "Identity", "ID": "Identity", "X": "X (NOT)", "NOT": "X (NOT)", "H": "H (Hadamard)",
+    "S": "S (Phase)", "SDG": "S† (S-dagger)", "S†": "S† (S-dagger)", "TDG": "T† (T-dagger)", "T†": "T† (T-dagger)",
+}
+
+POLARIZATION_ALIASES = {
+    "H": "Horizontal (|H⟩)", "V": "Vertical (|V⟩)", "D": "Diagonal (+45°)", "A": "Anti-diagonal (-45°)",
+}
+
+_STATE_NAMES = list(INITIAL_STATES)
+_STATE_STACK = np.stack([INITIAL_STATES[name] for name in _STATE_NAMES])
+_GATE_NAMES = list(GATES)
+_GATE_STACK = np.stack([GATES[name] for name in _GATE_NAMES])
+
+
+def _state_index(value):
+    name = str(value).strip().replace(">", "⟩")
+    name = STATE_ALIASES.get(name, name)
+    if name not in INITIAL_STATES:
+        raise ValueError(f"Unknown state: {value!r}")
+    return _STATE_NAMES.index(name)
+
+
+def _gate_index(value):
+    name = str(value).strip()
+    name = GATE_ALIASES.get(name.upper(), name) if name not in GATES else name
+    if name not in GATES:
+        raise ValueError(f"Unknown gate: {value!r}")
+    return _GATE_NAMES.index(name)
+
+
+def _finite(value, name):
+    # NaN and ±inf would turn every output field into invalid JSON
+    value = float(value)
+    if not np.isfinite(value):
+        raise ValueError(f"{name} must be a finite number, got {value}")
+    return value
+
+
+def _polarization_angle(value):
+    # A tab 3 preset (full name or H/V/D/A) or an angle in degrees
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return _finite(value, "polarization")
+    name = POLARIZATION_ALIASES.get(str(value).strip().upper(), value)
+    if name not in POLARIZATION_ANGLES:
+        raise ValueError(f"Unknown polarization: {value!r}")
+    return float(POLARIZATION_ANGLES[name])
+
+
+def _number(job, *names):
+    for name in names:
+        if name in job:
+            return _finite(job[name], name)
+    raise ValueError(f"Missing field: {names[0]!r}")
+
+
+def parse_job(job):
+    # Returns (job type, parameters); the type is taken from "type" or
+    # inferred from the fields present
+    if not isinstance(job, dict):
+        raise ValueError("Job must be a JSON object")
+    job_type = job.get("type") or ("gate" if "gate" in job else "rotation" if "axis" in job
+                                   else "faraday" if "verdet" in job else None)
+    if job_type == "gate":
+        return job_type, (_state_index(job.get("state", "|0⟩")), _gate_index(job["gate"]))
+    if job_type == "rotation":
+        axis = str(job["axis"]).strip().upper()
+        if axis not in ROTATION_AXES:
+            raise ValueError(f"Unknown rotation axis: {job['axis']!r}")
+        angle = _number(job, "angle_rad") if "angle_rad" in job else np.deg2rad(_number(job, "angle"))
+        return job_type, (_state_index(job.get("state", "|0⟩")), axis, angle)
+    if job_type == "faraday":
+        verdet, field, length = (_number(job, "verdet"), _number(job, "B", "magnetic_field"),
+                                 _number(job, "L", "path_length"))
+        _finite(verdet * field * length, "V·B·L")
+        return job_type, (_polarization_angle(job.get("polarization", 0.0)), verdet, field, length)
+    raise ValueError(f"Unknown job type: {job_type!r}" if job_type else "Cannot infer the job type")
+
+
+def _pairs(amplitudes):
+    # Complex amplitudes as [re, im] pairs, which JSON can carry
+    return np.stack([amplitudes.real, amplitudes.imag], axis=-1).tolist()
+
+
+def _qubit_results(amplitudes):
+    probabilities = np.abs(amplitudes) ** 2
+    return zip(_pairs(amplitudes), probabilities.tolist(), bloch_vector(amplitudes).tolist())
+
+
+def simulate_jobs(job_type, params):
+    # Physics for a list of parsed jobs of one type; yields one result dict
+    # per job without the id fields
+    columns = list(zip(*params))
+    if job_type == "gate":
+        states, gates = np.array(columns[0]), np.array(columns[1])
+        amplitudes = np.einsum("nij,nj->ni", _GATE_STACK[gates], _STATE_STACK[states])
+        for (pairs, probabilities, bloch), state, gate in zip(_qubit_results(amplitudes), states, gates):
+            yield {"state": _STATE_NAMES[state], "gate": _GATE_NAMES[gate],
+                   "amplitudes": pairs, "probabilities": probabilities, "bloch": bloch}
+    elif job_type == "rotation":
+        states, axes, angles = np.array(columns[0]), np.array(columns[1]), np.array(columns[2])
+        amplitudes = rotate_each(_STATE_STACK[states], axes, angles)
+        for (pairs, probabilities, bloch), state, axis, angle in zip(_qubit_results(amplitudes), states, axes,
+                                                                     np.rad2deg(angles).tolist()):
+            yield {"state": _STATE_NAMES[state], "axis": str(axis), "angle_deg": angle,
+                   "amplitudes": pairs, "probabilities": probabilities, "bloch": bloch}
+    else:
+        initial, verdet, field, length = (np.array(column) for column in columns)
+        theta = faraday_rotation(verdet, field, length)
+        rotation_deg = np.rad2deg(theta)
+        final = (initial + rotation_deg + 90) % 180 - 90
+        jones = jones_vector(initial + rotation_deg)
+        # As on the Faraday tab: the polarization qubit picks up Rz(2θ)
+        amplitudes = rotate_each(jones_vector(initial), np.full(theta.size, "Z"), 2 * theta)
+        for (pairs, probabilities, bloch), start, rad, deg, end, field_out in zip(
+                _qubit_results(amplitudes), initial.tolist(), theta.tolist(), rotation_deg.tolist(),
+                final.tolist(), _pairs(jones)):
+            yield {"polarization_deg": start, "rotation_rad": rad, "rotation_deg": deg,
+                   "final_polarization_deg": end, "jones": field_out,
+                   "amplitudes": pairs, "probabilities": probabilities, "bloch": bloch}
+
+
+def run_jobs(first_line, lines, render_dir=None):
+    # One chunk of input lines -> (JSONL text, jobs, errors)
+    results = [None] * len(lines)
+    groups = {job_type: [] for job_type in JOB_TYPES}
+    errors = 0
+    for index, line in enumerate(lines):
+        if not line.strip():
+            continue
+        line_number = first_line + index
+        job_id = line_number
+        try:
+            job = json.loads(line)
+            if isinstance(job, dict):
+                job_id = job.get("id", line_number)
+            job_type, params = parse_job(job)
+        except (ValueError, KeyError, TypeError) as error:
+            results[index] = {"id": job_id, "line": line_number, "error": f"{type(error).__name__}: {error}"}
+            errors += 1
+            continue
+        groups[job_type].append((index, job_id, params))
+
+    for job_type, jobs in groups.items():
+        if not jobs:
+            continue
+        outputs = simulate_jobs(job_type, [params for _, _, params in jobs])
+        for (index, job_id, _), output in zip(jobs, outputs):
+            results[index] = {"id": job_id, "type": job_type, **output}
+
+    if render_dir is not None:
+        from bloch_cache import bloch_vector_png
+
+        for index, result in enumerate(results):
+            if result is not None and "bloch" in result:
+                path = Path(render_dir) / f"job-{first_line + index}.png"
+                path.write_bytes(bloch_vector_png(result["bloch"]))
+                result["bloch_png"] = str(path)
+
+    text = "".join(json.dumps(result, ensure_ascii=False) + "\n" for result in results if result is not None)
+    return text, sum(result is not None for result in results), errors
+
+
+def _chunks(lines, chunk_size):
+    chunk, first_line = [], 1
+    for line_number, line in enumerate(lines, start=1):
+        chunk.append(line)
+        if len(chunk) == chunk_size:
+            yield first_line, chunk
+            chunk, first_line = [], line_number + 1
+    if chunk:
+        yield first_line, chunk
+
+
+def run_batch(lines, out, workers=None, chunk_size=CHUNK_SIZE, render_dir=None):
+    # Streams results to `out` as chunks finish, in input order, with at
+    # most two chunks per worker in flight so memory stays flat on any
+    # input size
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    jobs = errors = 0
+    if render_dir is not None:
+        Path(render_dir).mkdir(parents=True, exist_ok=True)
+
+    def write(outcome):
+        nonlocal jobs, errors
+        text, chunk_jobs, chunk_errors = outcome
+        out.write(text)
+        jobs += chunk_jobs
+        errors += chunk_errors
+
+    if workers == 1:
+        for first_line, chunk in _chunks(lines, chunk_size):
+            write(run_jobs(first_line, chunk, render_dir))
+    else:
+        # Spawned workers only import numpy and quantum_engine
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            pending = deque()
+            for first_line, chunk in _chunks(lines, chunk_size):
+                pending.append(pool.submit(run_jobs, first_line, chunk, render_dir))
+                if len(pending) >= 2 * workers:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+    out.flush()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "jobs": jobs,
+        "errors": errors,
+        "workers": workers,
+        "elapsed": elapsed,
+        "jobs_per_minute": jobs / elapsed * 60 if elapsed > 0 else float("inf"),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run gate, rotation and Faraday jobs from JSONL files.")
+    parser.add_argument("inputs", nargs="*", default=["-"], help="JSONL job files ('-' or none for stdin)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="jobs per worker task")
+    parser.add_argument("--render", metavar="DIR", default=None,
+                        help="also render each job's Bloch sphere to DIR/job-<line>.png (slow; needs qiskit)")
+    args = parser.parse_args(argv)
+
+    def lines():
+        for name in args.inputs:
+            if name == "-":
+                yield from sys.stdin
+            else:
+                with open(name, encoding="utf-8") as handle:
+                    yield from handle
+
+    summary = run_batch(lines(), sys.stdout, args.workers, args.chunk_size, args.render)
+    print(f"{summary['jobs']:,} jobs ({summary['errors']:,} errors) on {summary['workers']} workers in "
+          f"{summary['elapsed']:.2f} s - {summary['jobs_per_minute']:,.0f} jobs/min", file=sys.stderr)
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+import time
+
+import numpy as np
+
+# BB84 key post-processing: Cascade information reconciliation followed by
+# Toeplitz-hash privacy amplification. Keys go in and come out as packed
+# np.uint8 bitfields (np.packbits); both steps work on whole arrays.
+
+# Largest raw key the Streamlit lab post-processes after a run
+MAX_KEY_BITS = 4_000_000
+
+
+def _prefix_parity(bits):
+    # prefix[i] = parity of bits[:i], so the parity of bits[a:b] is
+    # prefix[b] ^ prefix[a] for any number of ranges at once
+    prefix = np.zeros(bits.size + 1, dtype=np.uint8)
+    np.bitwise_xor.accumulate(bits, out=prefix[1:])
+    return prefix
+
+
+def binary_entropy(p):
+    if p <= 0 or p >= 1:
+        return 0.0
+    return float(-p * np.log2(p) - (1 - p) * np.log2(1 - p))
+
+
+def cascade(alice_key, bob_key, key_length, qber, passes=4, seed=None):
+    # Returns Bob's corrected key (packed) and the number of parity bits
+    # Alice disclosed. Pass 1 uses blocks of ~0.73/QBER bits, and each later
+    # pass doubles the block size and reshuffles the key with a public
+    # permutation. All odd-parity blocks of a pass are binary-searched
+    # together, and every correction is re-checked against earlier passes
+    # (the "cascade") until every pass agrees.
+    rng = np.random.default_rng(seed)
+    alice = np.unpackbits(alice_key)[:key_length]
+    bob = np.unpackbits(bob_key)[:key_length].copy()
+    n = key_length
+    leaked = 0
+    if n == 0:
+        return np.packbits(bob), leaked
+
+    first_block = int(np.clip(0.73 / max(qber, 1e-3), 4, n))
+    pass_data = []
+
+    for p in range(passes):
+        perm = np.arange(n) if p == 0 else rng.permutation(n)
+        block = min(first_block << p, n)
+        starts = np.arange(0, n, block)
+        ends = np.minimum(starts + block, n)
+        alice_prefix = _prefix_parity(alice[perm])
+        alice_parity = alice_prefix[ends] ^ alice_prefix[starts]
+        leaked += starts.size
+        pass_data.append((perm, starts, ends, alice_prefix, alice_parity))
+
+        corrected = True
+        while corrected:
+            corrected = False
+            for perm_q, starts_q, ends_q, alice_prefix_q, alice_parity_q in pass_data:
+                bob_prefix = _prefix_parity(bob[perm_q])
+                bad = np.flatnonzero((bob_prefix[ends_q] ^ bob_prefix[starts_q]) != alice_parity_q)
+                if bad.size == 0:
+                    continue
+
+                # BINARY on every odd-parity block at once
+                lo, hi = starts_q[bad], ends_q[bad]
+                while True:
+                    active = hi - lo > 1
+                    if not active.any():
+                        break
+                    mid = (lo + hi) // 2
+                    leaked += int(active.sum())
+                    left_differs = (alice_prefix_q[mid] ^ alice_prefix_q[lo]) != (bob_prefix[mid] ^ bob_prefix[lo])
+                    hi = np.where(active & left_differs, mid, hi)
+                    lo = np.where(active & ~left_differs, mid, lo)
+
+                bob[perm_q[lo]] ^= 1
+                corrected = True
+
+    return np.packbits(bob), leaked
+
+
+def toeplitz_hash(keys, key_length, output_length, seed_bits):
+    # y = T·x mod 2 for the output_length x key_length Toeplitz matrix
+    # T[i, j] = seed_bits[i - j + key_length - 1]. Row i of T·x is entry
+    # i + key_length - 1 of the full convolution seed_bits * x, which an FFT
+    # computes in O(n log n) instead of the O(n·m) matrix product. A circular
+    # convolution of length >= n + m - 1 is enough: wrap-around never reaches
+    # the m entries we keep. `keys` may be one packed key or a stack of them;
+    # the seed is transformed once.
+    keys = np.asarray(keys, dtype=np.uint8)
+    if output_length <= 0:
+        return np.zeros(keys.shape[:-1] + (0,), dtype=np.uint8)
+    x = np.unpackbits(keys, axis=-1)[..., :key_length].astype(np.float64)
+    s = np.asarray(seed_bits[:key_length + output_length - 1], dtype=np.float64)
+    size = 1 << int(np.ceil(np.log2(s.size)))
+    conv = np.fft.irfft(np.fft.rfft(x, size) * np.fft.rfft(s, size), size)
+    window = conv[..., key_length - 1:key_length - 1 + output_length]
+    return np.packbits(np.rint(window).astype(np.int64) & 1, axis=-1)
+
+
+def secret_key_length(key_length, qber, leaked_bits, security_bits=64):
+    # Asymptotic BB84 bound: remove Eve's information n·h(Q), the parity
+    # bits disclosed during reconciliation and a security margin
+    return max(0, int(key_length * (1 - binary_entropy(qber)) - leaked_bits - security_bits))
+
+
+def postprocess_key(alice_key, bob_key, key_length, qber, passes=4, seed=None):
+    rng = np.random.default_rng(seed)
+
+    started = time.perf_counter()
+    corrected_bob, leaked = cascade(alice_key, bob_key, key_length, qber, passes=passes,
+                                    seed=int(rng.integers(2**63)))
+    ec_seconds = time.perf_counter() - started
+    residual_errors = int(np.count_nonzero(
+        np.unpackbits(np.bitwise_xor(alice_key, corrected_bob))[:key_length]
+    ))
+
+    final_length = secret_key_length(key_length, qber, leaked)
+    seed_bits = rng.integers(0, 2, size=key_length + max(final_length, 1) - 1, dtype=np.uint8)
+    started = time.perf_counter()
+    alice_final, bob_final = toeplitz_hash(np.stack([alice_key, corrected_bob]), key_length, final_length, seed_bits)
+    pa_seconds = time.perf_counter() - started
+
+    return {
+        "input_length": key_length,
+        "leaked_bits": leaked,
+        "residual_errors": residual_errors,
+        "ec_seconds": ec_seconds,
+        "ec_bits_per_second": key_length / ec_seconds if ec_seconds > 0 else float("inf"),
+        "final_length": final_length,
+        "alice_final_key": alice_final,
+        "bob_final_key": bob_final,
+        "keys_match": bool(np.array_equal(alice_final, bob_final)),
+        "pa_seconds": pa_seconds,
+        # Two keys are hashed, so each pass over the input counts
+        "pa_bits_per_second": 2 * key_length / pa_seconds if pa_seconds > 0 else float("inf"),
+    }
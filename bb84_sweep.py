@@ -0,0 +1,96 @@
+import itertools
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bb84 import run_chunk
+from bb84_postprocess import binary_entropy
+
+# Monte Carlo sweep of BB84 over channel and attack parameters. Every grid
+# point is run `repeats` times as independent protocol instances spread over
+# a process pool. Each instance gets its own child of one SeedSequence, so a
+# sweep is reproducible whatever the pool size or scheduling order.
+
+SWEEP_PARAMETERS = ("distance_km", "detector_efficiency", "dark_count_prob", "eve_fraction")
+
+# z-score for the two-sided 95% confidence intervals
+Z_95 = 1.959964
+
+
+def secret_key_rate(sifted_length, qber, num_qubits):
+    # Asymptotic Shor-Preskill rate in secret bits per qubit sent:
+    # sifted fraction x (1 - 2 h(Q)), zero above the ~11% threshold
+    return sifted_length / num_qubits * max(0.0, 1 - 2 * binary_entropy(qber))
+
+
+def _run_instance(task):
+    params, num_qubits, sample_fraction, seed_sequence = task
+    rng = np.random.default_rng(seed_sequence)
+    chunk = run_chunk(num_qubits, rng, sample_fraction, **params)
+    # Only scalars go back to the parent; the bit arrays stay in the worker
+    return {
+        "qber": chunk["qber"],
+        "detection_rate": chunk["detected"] / num_qubits,
+        "key_rate": secret_key_rate(chunk["sifted_length"], chunk["qber"], num_qubits),
+    }
+
+
+def _mean_ci(values):
+    values = np.asarray(values, dtype=np.float64)
+    mean = float(values.mean())
+    if values.size < 2:
+        return mean, 0.0
+    return mean, float(Z_95 * values.std(ddof=1) / np.sqrt(values.size))
+
+
+def sweep_grid(distance_km=(0.0,), detector_efficiency=(1.0,), dark_count_prob=(0.0,), eve_fraction=(0.0,)):
+    return [
+        dict(zip(SWEEP_PARAMETERS, values))
+        for values in itertools.product(distance_km, detector_efficiency, dark_count_prob, eve_fraction)
+    ]
+
+
+def run_sweep(grid, num_qubits=100_000, repeats=8, sample_fraction=0.1, seed=None,
+              max_workers=None, progress=None):
+    # `grid` is a list of parameter dicts (see sweep_grid). Returns one row
+    # per grid point with the mean and 95% CI half-width of QBER, detection
+    # rate and secret key rate. `progress(done, total)` is called as
+    # instances finish.
+    seeds = np.random.SeedSequence(seed).spawn(len(grid) * repeats)
+    tasks = [
+        (params, num_qubits, sample_fraction, seeds[index * repeats + run])
+        for index, params in enumerate(grid)
+        for run in range(repeats)
+    ]
+    max_workers = max_workers or os.cpu_count() or 1
+    started = time.perf_counter()
+
+    outcomes = []
+    # Spawned workers only import numpy and the bb84 modules, and avoid
+    # forking the threads of a running Streamlit server
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        chunksize = max(1, len(tasks) // (max_workers * 4))
+        for outcome in pool.map(_run_instance, tasks, chunksize=chunksize):
+            outcomes.append(outcome)
+            if progress is not None:
+                progress(len(outcomes), len(tasks))
+
+    rows = []
+    for index, params in enumerate(grid):
+        runs = outcomes[index * repeats:(index + 1) * repeats]
+        row = dict(params)
+        for name in ("qber", "detection_rate", "key_rate"):
+            row[name], row[name + "_ci"] = _mean_ci([run[name] for run in runs])
+        rows.append(row)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "runs": len(tasks),
+        "workers": max_workers,
+        "elapsed": elapsed,
+        "qubits_per_second": len(tasks) * num_qubits / elapsed if elapsed > 0 else float("inf"),
+    }
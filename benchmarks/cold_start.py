@@ -0,0 +1,134 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Cold-start benchmark for app.py.
+#
+# Every measurement runs in a fresh interpreter:
+#   * time to first paint: process spawn -> first script run finished
+#     (driven headlessly through streamlit.testing.v1.AppTest)
+#   * import time of each heavy module, from `python -X importtime`
+#
+# The run fails (exit code 1) if a module that should be lazy is imported
+# during first paint, or if --max-first-paint is exceeded.
+#
+#   python benchmarks/cold_start.py --runs 5
+#   python benchmarks/cold_start.py --json --max-first-paint 3.0
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+
+MODULES = [
+    "numpy",
+    "streamlit",
+    "qiskit",
+    "qiskit.quantum_info",
+    "qiskit.visualization",
+    "matplotlib.pyplot",
+    "PIL.Image",
+    "quantum_engine",
+    "bloch_cache",
+    "animations",
+    "faraday_plot",
+]
+
+# Top-level packages that the default tab must not need
+LAZY_PACKAGES = ["qiskit", "matplotlib", "mpl_toolkits", "PIL", "scipy"]
+
+
+def _child_first_paint():
+    imported = set()
+
+    def audit(event, args):
+        if event == "import":
+            imported.add(args[0].split(".")[0])
+
+    sys.addaudithook(audit)
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=300).run()
+    print(json.dumps({
+        "finished_at": time.time(),
+        "exception": bool(at.exception),
+        "lazy_loaded": sorted(imported & set(LAZY_PACKAGES)),
+    }))
+
+
+def measure_first_paint():
+    started_at = time.time()
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["seconds"] = report.pop("finished_at") - started_at
+    return report
+
+
+def measure_import(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    # Last line is the requested module; columns are self | cumulative | name
+    cumulative_us = int(result.stderr.strip().splitlines()[-1].split("|")[1])
+    return cumulative_us / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start time of the Streamlit app.")
+    parser.add_argument("--runs", type=int, default=3, help="fresh processes per measurement")
+    parser.add_argument("--json", action="store_true", help="print a JSON report instead of a table")
+    parser.add_argument("--max-first-paint", type=float, default=None,
+                        help="fail if the median time to first paint exceeds this many seconds")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child_first_paint()
+        return 0
+
+    paints = [measure_first_paint() for _ in range(args.runs)]
+    report = {
+        "first_paint_s": statistics.median(p["seconds"] for p in paints),
+        "first_paint_runs_s": [round(p["seconds"], 4) for p in paints],
+        "lazy_loaded_at_first_paint": sorted({m for p in paints for m in p["lazy_loaded"]}),
+        "app_exception": any(p["exception"] for p in paints),
+        "import_s": {
+            module: statistics.median(measure_import(module) for _ in range(args.runs))
+            for module in MODULES
+        },
+    }
+
+    failures = []
+    if report["app_exception"]:
+        failures.append("app raised an exception on first run")
+    if report["lazy_loaded_at_first_paint"]:
+        failures.append(f"imported at first paint: {', '.join(report['lazy_loaded_at_first_paint'])}")
+    if args.max_first_paint is not None and report["first_paint_s"] > args.max_first_paint:
+        failures.append(f"first paint {report['first_paint_s']:.3f}s > {args.max_first_paint:.3f}s")
+    report["failures"] = failures
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Time to first paint (median of {args.runs}): {report['first_paint_s']:.3f} s")
+        print()
+        print(f"{'module':<24}{'import (s)':>12}")
+        for module, seconds in report["import_s"].items():
+            print(f"{module:<24}{seconds:>12.3f}")
+        print()
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        if not failures:
+            print("OK")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+BASELINE_DIR = os.path.join(BENCHMARK_DIR, "baselines")
+
+# The simulation modules live next to app.py
+sys.path.insert(0, REPO_ROOT)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # Keep saved baselines in the repo instead of pytest-benchmark's default
+    # ./.benchmarks, unless a storage location was given on the command line
+    if not hasattr(config.option, "benchmark_storage"):
+        return
+    if config.option.benchmark_storage == "file://./.benchmarks":
+        config.option.benchmark_storage = "file://" + BASELINE_DIR
@@ -0,0 +1,297 @@
+import argparse
+import heapq
+import json
+import multiprocessing
+import os
+import queue
+import random
+import resource
+import sys
+import time
+
+import numpy as np
+
+# Concurrent-session load test for app.py, driven headlessly through
+# streamlit.testing.v1.AppTest.
+#
+# Each simulated student opens the page, then repeatedly clicks Apply Gate,
+# Apply Rotation (with the live animation) and the Faraday Run Simulation,
+# pausing for a random think time between clicks. A worker process plays one
+# server: it keeps an AppTest per session and runs every due click in order,
+# one at a time, as the GIL does for the script threads of a real server. A
+# click's latency therefore runs from when the student clicked to when the
+# rerun finished, queueing behind other students included. --processes
+# spreads the sessions over several such servers.
+#
+# AppTest always reruns the whole script, while the browser only reruns the
+# clicked tab's fragment, so the report also gives each click's own tab time
+# as recorded by tab_state.
+#
+#   python benchmarks/load_test.py --sessions 80 --iterations 3
+#   python benchmarks/load_test.py --sessions 20 --ramp 0 --json --max-p95 30
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+
+ACTIONS = ("gate", "rotation", "faraday")
+
+# Tab whose run time is reported for each click
+ACTION_TABS = {"load": None, "gate": "Standard Gates", "rotation": "Rotation Gates", "faraday": "Faraday Rotator"}
+
+STATES = ["|0⟩", "|1⟩", "|+⟩", "|-⟩"]
+POLARIZATIONS = ["Horizontal (|H⟩)", "Vertical (|V⟩)", "Diagonal (+45°)", "Anti-diagonal (-45°)"]
+RENDERERS = {"image": "Image (server)", "interactive": "Interactive (browser)"}
+
+
+def _preload():
+    # Import the heavy modules up front, as a warm server would have them,
+    # so the first clicks do not pay for the imports under the script timeout
+    import matplotlib.pyplot  # noqa: F401
+    import qiskit  # noqa: F401
+    import qiskit.quantum_info  # noqa: F401
+    import qiskit.visualization  # noqa: F401
+
+
+def _widget(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"No widget labelled {label!r}")
+
+
+def _open_figures():
+    pyplot = sys.modules.get("matplotlib.pyplot")
+    return len(pyplot.get_fignums()) if pyplot else 0
+
+
+def _peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+class Session:
+    def __init__(self, index, seed, renderer):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.rng = random.Random(seed)
+        self.at = AppTest.from_file(APP_PATH, default_timeout=300)
+        self.at.session_state["bloch_renderer"] = RENDERERS[renderer]
+
+    def act(self, action):
+        at, rng = self.at, self.rng
+        if action == "gate":
+            _widget(at.selectbox, "**Initial Qubit State:**").set_value(rng.choice(STATES))
+            _widget(at.button, "🚀 Apply Gate").click()
+        elif action == "rotation":
+            at.selectbox(key="rot_state").set_value(rng.choice(STATES))
+            _widget(at.radio, "**Rotation Axis:**").set_value(rng.choice("XYZ"))
+            _widget(at.slider, "**Rotation Angle (degrees):**").set_value(rng.randrange(15, 361, 15))
+            _widget(at.checkbox, "🎬 Show rotation animation").check()
+            at.button(key="apply_rot").click()
+        elif action == "faraday":
+            _widget(at.radio, "**Initial Polarization:**").set_value(rng.choice(POLARIZATIONS))
+            _widget(at.slider, "**Magnetic Field (Tesla):**").set_value(round(rng.uniform(0.1, 5.0), 1))
+            _widget(at.button, "🔬 Run Simulation").click()
+        at.run()
+
+    def tab_seconds(self, action):
+        # This session's last run of the clicked tab, from tab_state's log
+        tab = ACTION_TABS[action]
+        runs = self.at.session_state["tab_latency"].get(tab) if tab and "tab_latency" in self.at.session_state else None
+        return runs[-1][0] if runs else None
+
+
+def _worker(worker_index, session_indices, args, barrier, results):
+    sys.path.insert(0, REPO_ROOT)
+    _preload()
+    from profiler import PROCESS_TIMINGS, summary_rows
+
+    sessions = [Session(index, args.seed + index, args.renderer) for index in session_indices]
+    baseline_mb = _peak_rss_mb()
+    barrier.wait()
+
+    # (due time, order, session, step); step 0 is the page load
+    started = time.perf_counter()
+    schedule = []
+    for order, session in enumerate(sessions):
+        heapq.heappush(schedule, (started + session.rng.uniform(0, args.ramp), order, session, 0))
+
+    samples, errors = [], []
+    max_figures = 0
+    steps = 1 + args.iterations * len(ACTIONS)
+    while schedule:
+        due, order, session, step = heapq.heappop(schedule)
+        wait = due - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        action = "load" if step == 0 else ACTIONS[(step - 1) % len(ACTIONS)]
+        begun = time.perf_counter()
+        try:
+            if step:
+                session.act(action)
+            else:
+                session.at.run()
+            failure = session.at.exception[0].message if session.at.exception else None
+        except Exception as error:
+            failure = f"{type(error).__name__}: {error}"
+        finished = time.perf_counter()
+        max_figures = max(max_figures, _open_figures())
+
+        if failure:
+            errors.append({"session": session.index, "action": action, "error": failure})
+        samples.append({
+            "action": action,
+            "latency": finished - due,
+            "service": finished - begun,
+            "tab": session.tab_seconds(action),
+            "finished": finished - started,
+        })
+        if step + 1 < steps:
+            think = session.rng.uniform(*args.think)
+            heapq.heappush(schedule, (finished + think, order, session, step + 1))
+
+    results.put({
+        "worker": worker_index,
+        "sessions": len(sessions),
+        "samples": samples,
+        "errors": errors,
+        "elapsed": time.perf_counter() - started,
+        "baseline_rss_mb": baseline_mb,
+        "peak_rss_mb": _peak_rss_mb(),
+        "max_open_figures": max_figures,
+        "open_figures": _open_figures(),
+        "stages": summary_rows(PROCESS_TIMINGS),
+    })
+
+
+def _percentiles(values):
+    values = np.asarray([v for v in values if v is not None], dtype=float)
+    if not values.size:
+        return None
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"count": int(values.size), "p50_s": round(p50, 4), "p95_s": round(p95, 4), "p99_s": round(p99, 4),
+            "max_s": round(float(values.max()), 4)}
+
+
+def run_load_test(args):
+    context = multiprocessing.get_context("spawn")
+    processes = min(args.processes, args.sessions)
+    barrier = context.Barrier(processes)
+    results = context.Queue()
+    workers = [
+        context.Process(target=_worker, args=(w, list(range(w, args.sessions, processes)), args, barrier, results))
+        for w in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    reports = []
+    while len(reports) < len(workers):
+        try:
+            reports.append(results.get(timeout=5))
+        except queue.Empty:
+            crashed = [worker.exitcode for worker in workers if worker.exitcode not in (None, 0)]
+            if crashed:
+                for worker in workers:
+                    worker.terminate()
+                raise RuntimeError(f"load-test worker exited with code {crashed[0]}")
+    for worker in workers:
+        worker.join()
+
+    samples = [sample for report in reports for sample in report["samples"]]
+    clicks = [sample for sample in samples if sample["action"] != "load"]
+    elapsed = max(report["elapsed"] for report in reports)
+    return {
+        "sessions": args.sessions,
+        "processes": processes,
+        "iterations": args.iterations,
+        "renderer": args.renderer,
+        "elapsed_s": round(elapsed, 2),
+        "throughput_clicks_per_s": round(len(clicks) / elapsed, 3),
+        "latency": {action: _percentiles(s["latency"] for s in samples if s["action"] == action)
+                    for action in ("load", *ACTIONS)},
+        "latency_all_clicks": _percentiles(s["latency"] for s in clicks),
+        "service": {action: _percentiles(s["service"] for s in samples if s["action"] == action)
+                    for action in ("load", *ACTIONS)},
+        "tab_time": {action: _percentiles(s["tab"] for s in samples if s["action"] == action) for action in ACTIONS},
+        "baseline_rss_mb": [round(r["baseline_rss_mb"], 1) for r in reports],
+        "peak_rss_mb": [round(r["peak_rss_mb"], 1) for r in reports],
+        "max_open_figures": max(r["max_open_figures"] for r in reports),
+        "open_figures_at_end": sum(r["open_figures"] for r in reports),
+        "slowest_stages": sorted((row for r in reports for row in r["stages"]),
+                                 key=lambda row: row["p95 (ms)"], reverse=True)[:8],
+        "errors": [error for r in reports for error in r["errors"]],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the Streamlit app with concurrent simulated sessions.")
+    parser.add_argument("--sessions", type=int, default=80, help="simulated students")
+    parser.add_argument("--iterations", type=int, default=2, help="rounds of gate, rotation and Faraday clicks")
+    parser.add_argument("--processes", type=int, default=1, help="server processes to spread the sessions over")
+    parser.add_argument("--think", type=float, nargs=2, default=(3.0, 10.0), metavar=("MIN", "MAX"),
+                        help="think time between clicks, seconds")
+    parser.add_argument("--ramp", type=float, default=5.0,
+                        help="sessions open the page within this many seconds (0: all at once)")
+    parser.add_argument("--renderer", choices=RENDERERS, default="image",
+                        help="Bloch sphere setting of every session; 'image' renders on the server")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print a JSON report instead of a table")
+    parser.add_argument("--max-p95", type=float, default=None,
+                        help="fail if the p95 click latency exceeds this many seconds")
+    parser.add_argument("--max-open-figures", type=int, default=None,
+                        help="fail if more matplotlib figures than this are left open")
+    args = parser.parse_args()
+
+    report = run_load_test(args)
+
+    failures = []
+    if report["errors"]:
+        failures.append(f"{len(report['errors'])} clicks raised in the app")
+    p95 = (report["latency_all_clicks"] or {}).get("p95_s")
+    if args.max_p95 is not None and p95 is not None and p95 > args.max_p95:
+        failures.append(f"p95 click latency {p95:.2f}s > {args.max_p95:.2f}s")
+    if args.max_open_figures is not None and report["open_figures_at_end"] > args.max_open_figures:
+        failures.append(f"{report['open_figures_at_end']} matplotlib figures left open")
+    report["failures"] = failures
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(f"{report['sessions']} sessions on {report['processes']} process(es), "
+              f"{report['iterations']} rounds each, {report['renderer']} Bloch spheres")
+        print(f"Wall time {report['elapsed_s']:.1f} s, throughput {report['throughput_clicks_per_s']:.2f} clicks/s")
+        print()
+        # Latency includes queueing behind other sessions; the run and tab
+        # columns are the click's own full script run and its tab's share
+        print(f"{'click':<10}{'count':>7}{'p50 (s)':>10}{'p95 (s)':>10}{'p99 (s)':>10}{'max (s)':>10}"
+              f"{'run p95':>10}{'tab p95':>10}")
+        for action, stats in report["latency"].items():
+            if stats:
+                tab = report["tab_time"].get(action)
+                tab_p95 = f"{tab['p95_s']:>10.3f}" if tab else f"{'-':>10}"
+                print(f"{action:<10}{stats['count']:>7}{stats['p50_s']:>10.3f}{stats['p95_s']:>10.3f}"
+                      f"{stats['p99_s']:>10.3f}{stats['max_s']:>10.3f}{report['service'][action]['p95_s']:>10.3f}"
+                      f"{tab_p95}")
+        print()
+        print(f"Peak RSS per process: {', '.join(f'{mb:.0f} MB' for mb in report['peak_rss_mb'])} "
+              f"(after imports and session setup: {', '.join(f'{mb:.0f} MB' for mb in report['baseline_rss_mb'])})")
+        print(f"Open matplotlib figures: max {report['max_open_figures']}, at the end {report['open_figures_at_end']}")
+        print()
+        print("Slowest stages (p95):")
+        for row in report["slowest_stages"]:
+            print(f"  {row['Tab']:<18}{row['Stage']:<18}{row['p95 (ms)']:>10.1f} ms  ({row['Count']} samples)")
+        print()
+        for error in report["errors"][:10]:
+            print(f"ERROR session {error['session']} {error['action']}: {error['error']}")
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        if not failures:
+            print("OK")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from bb84 import run_bb84
+from bb84_postprocess import cascade, toeplitz_hash
+
+# Correctness checks for BB84 post-processing; like the other test_<module>.py
+# files here they need neither pytest-benchmark nor timing.
+
+
+def test_cascade_leaves_no_errors():
+    result = run_bb84(200_000, eve_fraction=0.2, seed=3)
+    assert result["key_errors"] > 0
+    corrected, leaked = cascade(result["alice_key"], result["bob_key"], result["key_length"], result["qber"], seed=3)
+    bits = np.unpackbits(corrected)[:result["key_length"]]
+    assert np.count_nonzero(bits != result["alice_key_bits"]) == 0
+    assert 0 < leaked < result["key_length"]
+
+
+@pytest.mark.parametrize("key_length, output_length", [(1, 1), (13, 5), (257, 100), (1000, 999)])
+def test_toeplitz_hash_matches_dense_product(key_length, output_length):
+    rng = np.random.default_rng(key_length)
+    keys = rng.integers(0, 2, size=(3, key_length), dtype=np.uint8)
+    seed_bits = rng.integers(0, 2, size=key_length + output_length - 1, dtype=np.uint8)
+    rows, cols = np.indices((output_length, key_length))
+    toeplitz = seed_bits[rows - cols + key_length - 1].astype(np.int64)
+    expected = (keys.astype(np.int64) @ toeplitz.T) % 2
+
+    hashed = toeplitz_hash(np.packbits(keys, axis=-1), key_length, output_length, seed_bits)
+    assert np.array_equal(np.unpackbits(hashed, axis=-1)[:, :output_length], expected)
+    assert np.array_equal(toeplitz_hash(np.packbits(keys[0]), key_length, output_length, seed_bits), hashed[0])
@@ -0,0 +1,229 @@
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from batch import run_jobs
+from bb84 import run_bb84
+from bb84_postprocess import cascade, toeplitz_hash
+from bloch_cache import BlochImageCache, render_bloch_png
+from dfs_bb84 import compare_dfs
+from noise import noise_sweep
+from optics import CHAIN_PRESETS, OpticalChain
+from quantum_engine import (
+    FIELD_RANGE, GATES, INITIAL_STATES, LENGTH_RANGE, VERDET_RANGE, bloch_vector, build_rotation_circuit,
+    faraday_grid, faraday_rotation, faraday_state, jones_to_bloch, jones_vector, propagation_profile,
+    rotate_batch, rotation_sweep, simulate_gate,
+)
+from statevector import simulate_circuit
+
+# Performance suite for the headless simulation core.
+#
+# Record a baseline (stored under benchmarks/baselines/):
+#   pytest benchmarks --benchmark-save=baseline
+# Fail the run if anything got more than 25% slower than the last baseline:
+#   pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:25%
+
+
+@pytest.mark.benchmark(group="gates")
+def test_gate_application(benchmark):
+    def run():
+        return [simulate_gate(state, gate) for state in INITIAL_STATES for gate in GATES]
+
+    results = benchmark(run)
+    assert len(results) == len(INITIAL_STATES) * len(GATES)
+
+
+@pytest.mark.benchmark(group="gates")
+def test_gate_application_qiskit(benchmark):
+    pytest.importorskip("qiskit")
+
+    def run():
+        return [simulate_gate(state, gate, backend="qiskit") for state in INITIAL_STATES for gate in GATES]
+
+    benchmark.pedantic(run, rounds=5, warmup_rounds=1)
+
+
+@pytest.mark.benchmark(group="rotation")
+@pytest.mark.parametrize("axis", ["X", "Y", "Z"])
+def test_rotation_sweep(benchmark, axis):
+    angles = np.linspace(0, 2 * np.pi, 10_000)
+    amplitudes, vectors = benchmark(rotate_batch, "|+⟩", axis, angles)
+    assert amplitudes.shape == (10_000, 2)
+    assert vectors.shape == (10_000, 3)
+
+
+@pytest.mark.benchmark(group="rotation")
+def test_rotation_full_sweep(benchmark):
+    # All 4 initial states x 3 axes x 10k angles in one call
+    result = benchmark(rotation_sweep, np.linspace(0, 2 * np.pi, 10_000))
+    assert result["bloch"].shape == (4, 3, 10_000, 3)
+
+
+@pytest.mark.benchmark(group="faraday")
+def test_faraday_physics(benchmark):
+    def run():
+        theta = faraday_rotation(50.0, 1.0, 0.1)
+        rotation_angles, _ = propagation_profile(np.rad2deg(theta) % 360, 0.1, 50)
+        jones = jones_vector(45 + rotation_angles)
+        return jones_to_bloch(jones), faraday_state("Diagonal (+45°)", theta)
+
+    vectors, _ = benchmark(run)
+    assert vectors.shape == (50, 3)
+
+
+@pytest.mark.benchmark(group="faraday")
+def test_faraday_frames(benchmark):
+    faraday_plot = pytest.importorskip("faraday_plot")
+    rotation_angles, distances = propagation_profile(286.5, 0.1, 25)
+
+    def run():
+        renderer = faraday_plot.FaradayRenderer(0, 1.0, dpi=80)
+        return [renderer.render(angle, distance) for angle, distance in zip(rotation_angles, distances)]
+
+    frames = benchmark.pedantic(run, rounds=3, warmup_rounds=1)
+    assert len(frames) == 25
+
+
+@pytest.mark.benchmark(group="faraday")
+def test_faraday_grid(benchmark):
+    # The parameter-space explorer's default 100 x 100 x 100 grid
+    axes = [np.linspace(*limits, 100) for limits in (VERDET_RANGE, FIELD_RANGE, LENGTH_RANGE)]
+    rotation, intensity = benchmark(faraday_grid, *axes, 0.0, 90.0)
+    assert rotation.shape == intensity.shape == (100, 100, 100)
+
+
+@pytest.mark.benchmark(group="faraday")
+def test_optical_chain(benchmark):
+    # An isolator with a wave plate swept over 1000 angles, 1000 inputs each way
+    inputs = jones_vector(np.linspace(0, 180, 1000))[:, None, :]
+
+    def run():
+        chain = OpticalChain(CHAIN_PRESETS["Optical isolator"])
+        chain.insert(1, "Half-wave plate", np.linspace(0, 90, 1000))
+        return chain.evaluate(inputs, "forward"), chain.evaluate(inputs, "backward")
+
+    forward, backward = benchmark(run)
+    assert forward.shape == backward.shape == (1000, 1000, 2)
+
+
+@pytest.mark.benchmark(group="batch")
+def test_batch_chunk(benchmark):
+    # One worker task of the batch CLI: 5000 mixed JSONL jobs parsed,
+    # simulated and serialized
+    rng = np.random.default_rng(7)
+    jobs = []
+    for index in range(5000):
+        if index % 3 == 0:
+            jobs.append({"id": index, "state": "+", "gate": list(GATES)[index % len(GATES)]})
+        elif index % 3 == 1:
+            jobs.append({"id": index, "state": "0", "axis": "XYZ"[index // 3 % 3], "angle": float(rng.uniform(0, 360))})
+        else:
+            jobs.append({"id": index, "polarization": "D", "verdet": 50.0, "B": float(rng.uniform(0, 5)), "L": 0.1})
+    lines = [json.dumps(job) + "\n" for job in jobs]
+
+    text, count, errors = benchmark(run_jobs, 1, lines)
+    assert (count, errors) == (5000, 0)
+
+
+@pytest.mark.benchmark(group="bloch")
+def test_bloch_render(benchmark):
+    pytest.importorskip("qiskit")
+    vector = tuple(bloch_vector(INITIAL_STATES["|+⟩"]))
+    png = benchmark.pedantic(render_bloch_png, args=(vector,), rounds=3, warmup_rounds=1)
+    assert png.startswith(b"\x89PNG")
+
+
+@pytest.mark.benchmark(group="bloch")
+def test_bloch_render_cached(benchmark):
+    cache = BlochImageCache(render=lambda vector: b"png")
+    cache.get_png(INITIAL_STATES["|+⟩"])
+    benchmark(cache.get_png, INITIAL_STATES["|+⟩"])
+    assert cache.hits > 0
+
+
+@pytest.mark.benchmark(group="circuit-diagram")
+def test_circuit_diagram_render(benchmark):
+    pytest.importorskip("pylatexenc")
+    from circuit_cache import render_circuit_svg
+
+    qc = build_rotation_circuit("|+⟩", "Y", np.pi / 3)
+    svg, error = benchmark.pedantic(render_circuit_svg, args=(qc,), rounds=3, warmup_rounds=1)
+    assert error is None and svg.rstrip().endswith("</svg>")
+
+
+@pytest.mark.benchmark(group="circuit-diagram")
+def test_circuit_diagram_cached(benchmark):
+    pytest.importorskip("qiskit")
+    from circuit_cache import CircuitDiagramCache
+
+    # The lookup includes hashing the circuit, as in the app
+    cache = CircuitDiagramCache(render=lambda qc, style: ("<svg></svg>", None))
+    cache.get(build_rotation_circuit("|+⟩", "Y", np.pi / 3))
+    benchmark(lambda: cache.get(build_rotation_circuit("|+⟩", "Y", np.pi / 3)))
+    assert cache.hits > 0
+
+
+@pytest.mark.benchmark(group="bb84")
+def test_bb84_protocol(benchmark):
+    result = benchmark.pedantic(run_bb84, args=(1_000_000,), kwargs={"seed": 7}, rounds=5, warmup_rounds=1)
+    assert result["key_errors"] == 0
+
+
+@pytest.mark.benchmark(group="bb84")
+def test_bb84_dfs_comparison(benchmark):
+    result = benchmark.pedantic(compare_dfs, args=(1_000_000, 1.0), kwargs={"seed": 7}, rounds=3, warmup_rounds=1)
+    assert result["DFS"]["qber"] == 0.0
+    assert result["Unencoded"]["qber"] > 0.05
+
+
+@pytest.fixture(scope="module")
+def noisy_key():
+    return run_bb84(2_000_000, eve_fraction=0.2, seed=7)
+
+
+@pytest.mark.benchmark(group="bb84")
+def test_bb84_cascade(benchmark, noisy_key):
+    corrected, _ = benchmark.pedantic(
+        cascade, args=(noisy_key["alice_key"], noisy_key["bob_key"], noisy_key["key_length"], noisy_key["qber"]),
+        kwargs={"seed": 7}, rounds=5, warmup_rounds=1,
+    )
+    assert np.array_equal(corrected, noisy_key["alice_key"])
+
+
+@pytest.mark.benchmark(group="bb84")
+def test_bb84_privacy_amplification(benchmark, noisy_key):
+    n = noisy_key["key_length"]
+    seed_bits = np.random.default_rng(7).integers(0, 2, size=n + n // 2 - 1, dtype=np.uint8)
+    hashed = benchmark.pedantic(toeplitz_hash, args=(noisy_key["alice_key"], n, n // 2, seed_bits),
+                                rounds=5, warmup_rounds=1)
+    assert hashed.size == (n // 2 + 7) // 8
+
+
+@pytest.mark.benchmark(group="statevector")
+def test_statevector_ghz(benchmark):
+    n = 20
+    ops = [("H", (0,), None)] + [("CNOT", (q, q + 1), None) for q in range(n - 1)] + [("Rx", (q,), 0.3) for q in range(n)]
+    result = benchmark.pedantic(simulate_circuit, args=(n, ops), rounds=3, warmup_rounds=1)
+    assert np.isclose(np.vdot(result["state"], result["state"]).real, 1.0)
+
+
+@pytest.mark.benchmark(group="statevector")
+@pytest.mark.parametrize("fuse", [False, True], ids=["unfused", "fused"])
+def test_statevector_prep_chains(benchmark, fuse):
+    # |−⟩ preparation (X, H) plus a rotation and a T/T† pair on every wire
+    n = 18
+    ops = [(name, (q,), angle) for q in range(n)
+           for name, angle in (("X", None), ("H", None), ("T", None), ("T†", None), ("Rz", 0.7))]
+    result = benchmark.pedantic(simulate_circuit, args=(n, ops), kwargs={"fuse": fuse}, rounds=3, warmup_rounds=1)
+    assert result["gates_simulated"] == (n if fuse else len(ops))
+
+
+@pytest.mark.benchmark(group="noise")
+@pytest.mark.parametrize("channel", ["Depolarizing", "Amplitude damping", "Phase damping", "Collective dephasing"])
+def test_noise_sweep(benchmark, channel):
+    result = benchmark(noise_sweep, "|+⟩", channel, np.linspace(0, 1, 501))
+    assert result["bloch"].shape == (501, 3)
+    assert np.all(np.linalg.norm(result["bloch"], axis=1) <= 1 + 1e-12)
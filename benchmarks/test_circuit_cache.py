@@ -0,0 +1,36 @@
+import pytest
+
+from circuit_cache import CircuitDiagramCache
+
+qiskit = pytest.importorskip("qiskit")
+
+
+def _circuit(num_qubits):
+    qc = qiskit.QuantumCircuit(num_qubits)
+    qc.h(0)
+    return qc
+
+
+def test_failed_render_is_retried_after_the_ttl():
+    calls = []
+
+    def render(qc, style):
+        calls.append(qc.num_qubits)
+        return (None, "RuntimeError: no drawer") if len(calls) == 1 else ("<svg></svg>", None)
+
+    cache = CircuitDiagramCache(render=render, failure_ttl=60)
+    assert cache.get(_circuit(1)) == (None, "RuntimeError: no drawer")
+    assert cache.get(_circuit(1)) == (None, "RuntimeError: no drawer")
+    assert len(calls) == 1 and len(cache.failures()) == 1
+
+    cache.failure_ttl = 0
+    assert cache.get(_circuit(1)) == ("<svg></svg>", None)
+    assert len(calls) == 2 and cache.failures() == {}
+
+
+def test_evicted_failures_leave_nothing_behind():
+    cache = CircuitDiagramCache(max_bytes=64, render=lambda qc, style: (None, "x" * 40))
+    for num_qubits in range(1, 6):
+        cache.get(_circuit(num_qubits))
+    assert cache.stats()["entries"] == 1
+    assert len(cache.failures()) == 1
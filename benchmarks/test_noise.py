@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from noise import CHANNELS, apply_channel, channel_kraus, density_matrix
+from quantum_engine import INITIAL_STATES
+
+
+@pytest.mark.parametrize("channel", CHANNELS)
+def test_kraus_operators_preserve_trace(channel):
+    num_qubits = 2 if channel == "Collective dephasing" else 1
+    kraus = channel_kraus(channel, np.linspace(0, 1, 11), num_qubits)
+    completeness = np.einsum("mkji,mkjl->mil", kraus.conj(), kraus)
+    np.testing.assert_allclose(completeness, np.broadcast_to(np.eye(2 ** num_qubits), completeness.shape), atol=1e-12)
+
+
+@pytest.mark.parametrize("channel", CHANNELS[:3])
+def test_channels_keep_unit_trace(channel):
+    rho = apply_channel(density_matrix(INITIAL_STATES["|+⟩"]), channel_kraus(channel, np.linspace(0, 1, 11)))
+    np.testing.assert_allclose(np.trace(rho, axis1=-2, axis2=-1), 1.0, atol=1e-12)
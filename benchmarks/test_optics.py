@@ -0,0 +1,30 @@
+import numpy as np
+
+from optics import CHAIN_PRESETS, OpticalChain, intensity
+from quantum_engine import jones_vector
+
+
+def test_isolator_passes_forward_and_blocks_backward():
+    chain = OpticalChain(CHAIN_PRESETS["Optical isolator"])
+    forward = chain.evaluate(jones_vector(0.0), "forward")
+    np.testing.assert_allclose(forward, jones_vector(45.0), atol=1e-12)
+    # Light coming back at 45° is turned to 90° and stopped by the input polarizer
+    backward = chain.evaluate(jones_vector(45.0), "backward")
+    assert intensity(backward) < 1e-24
+
+
+def test_faraday_mirror_returns_orthogonal_polarization():
+    chain = OpticalChain(CHAIN_PRESETS["Faraday mirror (double pass)"])
+    inputs = jones_vector(np.linspace(0, 180, 37))
+    outputs = chain.evaluate(inputs, "double pass")
+    np.testing.assert_allclose(intensity(outputs), 1.0, atol=1e-12)
+    np.testing.assert_allclose(np.abs(np.sum(inputs.conj() * outputs, axis=-1)), 0.0, atol=1e-12)
+
+
+def test_cached_products_follow_element_changes():
+    chain = OpticalChain(CHAIN_PRESETS["Optical isolator"])
+    chain.matrix()
+    chain.set(2, "Polarizer", 90.0)
+    fresh = OpticalChain(CHAIN_PRESETS["Optical isolator"][:2] + [("Polarizer", 90.0)])
+    np.testing.assert_allclose(chain.matrix(), fresh.matrix(), atol=1e-12)
+    assert chain.recomputed == 1
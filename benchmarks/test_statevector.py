@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from statevector import GATE_NAMES, ROTATION_GATES, TWO_QUBIT_GATES, build_multi_qubit_circuit, simulate_circuit
+
+
+def _random_circuit(rng, num_qubits, num_gates):
+    ops = []
+    for _ in range(num_gates):
+        name = GATE_NAMES[rng.integers(len(GATE_NAMES))]
+        if name in TWO_QUBIT_GATES:
+            ops.append((name, tuple(int(q) for q in rng.choice(num_qubits, 2, replace=False)), None))
+        else:
+            angle = float(rng.uniform(-np.pi, np.pi)) if name in ROTATION_GATES else None
+            ops.append((name, (int(rng.integers(num_qubits)),), angle))
+    return ops
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("fuse", [False, True], ids=["unfused", "fused"])
+def test_statevector_matches_qiskit(seed, fuse):
+    quantum_info = pytest.importorskip("qiskit.quantum_info")
+    rng = np.random.default_rng(seed)
+    num_qubits = int(rng.integers(2, 7))
+    ops = _random_circuit(rng, num_qubits, 40)
+
+    state = simulate_circuit(num_qubits, ops, fuse=fuse)["state"]
+    expected = quantum_info.Statevector(build_multi_qubit_circuit(num_qubits, ops)).data
+    np.testing.assert_allclose(state, expected, atol=1e-10)
+
+
+def test_fusion_collapses_single_qubit_runs():
+    ops = [(name, (q,), angle) for q in range(3)
+           for name, angle in (("X", None), ("H", None), ("Rz", 0.7), ("T", None))] + [("CNOT", (0, 1), None)]
+    unfused, fused = simulate_circuit(3, ops), simulate_circuit(3, ops, fuse=True)
+    assert fused["gates_simulated"] == 4
+    np.testing.assert_allclose(fused["state"], unfused["state"], atol=1e-12)
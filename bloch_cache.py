@@ -0,0 +1,131 @@
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from quantum_engine import bloch_vector
+
+# Process-wide LRU cache of rendered Bloch-sphere PNGs.
+# Entries are keyed by the Bloch vector rounded to `precision` decimals, so
+# states that land on the same point of the sphere share one render.
+
+_PAULI = (
+    np.eye(2, dtype=np.complex128),
+    np.array([[0, 1], [1, 0]], dtype=np.complex128),
+    np.array([[0, -1j], [1j, 0]], dtype=np.complex128),
+    np.array([[1, 0], [0, -1]], dtype=np.complex128),
+)
+
+
+def render_bloch_png(vector, dpi=200):
+    from qiskit.visualization import plot_bloch_multivector
+    import matplotlib.pyplot as plt
+
+    # Rebuild the density matrix from the (quantized) Bloch vector so the
+    # picture matches the cache key exactly
+    x, y, z = vector
+    rho = 0.5 * (_PAULI[0] + x * _PAULI[1] + y * _PAULI[2] + z * _PAULI[3])
+    fig = plot_bloch_multivector(rho)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+class ImageCache:
+    # Thread-safe LRU of rendered images, capped at `max_bytes` and shared by
+    # every session of the process. Subclasses build the key and call _get().
+    def __init__(self, max_bytes, render):
+        self.max_bytes = max_bytes
+        self._render = render
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _size(self, value):
+        return len(value)
+
+    def _get(self, key, *render_args):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        # Render outside the lock so other sessions are not blocked
+        value = self._render(*render_args)
+
+        size = self._size(value)
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = value
+                self.current_bytes += size
+                while self.current_bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.current_bytes -= self._size(evicted)
+                    self.evictions += 1
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def discard(self, key):
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is not None:
+                self.current_bytes -= self._size(value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+
+class BlochImageCache(ImageCache):
+    def __init__(self, precision=3, max_bytes=64 * 1024 * 1024, render=render_bloch_png):
+        super().__init__(max_bytes, render)
+        self.precision = precision
+
+    def key(self, state):
+        return self.vector_key(bloch_vector(state))
+
+    def vector_key(self, vector):
+        vector = np.round(vector, self.precision)
+        # Adding 0.0 folds -0.0 into 0.0 so both round to the same key
+        return tuple(float(v) + 0.0 for v in vector)
+
+    def get_png(self, state):
+        return self.get_vector_png(bloch_vector(state))
+
+    def get_vector_png(self, vector):
+        # Mixed states land inside the sphere, so they are looked up by
+        # their Bloch vector directly
+        key = self.vector_key(vector)
+        return self._get(key, key)
+
+
+BLOCH_CACHE = BlochImageCache()
+
+
+def bloch_png(state):
+    return BLOCH_CACHE.get_png(state)
+
+
+def bloch_vector_png(vector):
+    return BLOCH_CACHE.get_vector_png(vector)
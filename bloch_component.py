@@ -0,0 +1,31 @@
+import os
+
+import numpy as np
+import streamlit.components.v1 as components
+
+# Interactive Bloch sphere drawn in the browser. Only Bloch vectors (or a
+# whole trajectory) travel over the websocket as JSON; drawing, rotating and
+# trajectory playback all happen client-side.
+
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "bloch_sphere")
+_bloch_sphere = components.declare_component("bloch_sphere", path=_FRONTEND_DIR)
+
+
+def _to_json_vectors(vectors, decimals):
+    if vectors is None:
+        return []
+    vectors = np.round(np.asarray(vectors, dtype=np.float64).reshape(-1, 3), decimals)
+    return (vectors + 0.0).tolist()
+
+
+def bloch_sphere(vectors=None, trajectory=None, frame_ms=100, height=420, key=None, decimals=4):
+    # `vectors` are static arrows; `trajectory` is an (N, 3) path that the
+    # browser animates at `frame_ms` per point
+    return _bloch_sphere(
+        vectors=_to_json_vectors(vectors, decimals),
+        trajectory=_to_json_vectors(trajectory, decimals),
+        frame_ms=int(frame_ms),
+        height=int(height),
+        key=key,
+        default=None,
+    )
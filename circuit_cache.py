@@ -0,0 +1,111 @@
+import hashlib
+import io
+import logging
+import time
+
+import numpy as np
+
+from bloch_cache import ImageCache
+
+# Process-wide cache of circuit diagrams rendered with qc.draw(output='mpl').
+# A diagram only depends on the circuit's structure, so entries are
+# content-addressed: the key is a SHA-256 of the register sizes and every
+# instruction's name, label, qubits, clbits and parameters. Diagrams are
+# stored as SVG text. A failed render is cached too, together with the
+# reason, so the slow mpl path is not retried on every rerun, but only for
+# FAILURE_TTL seconds in case the failure was transient.
+
+logger = logging.getLogger(__name__)
+
+DIAGRAM_STYLE = "iqp"
+
+# Decimals kept for gate parameters; finer than any diagram label
+PARAM_PRECISION = 12
+
+# Seconds before a failed render is tried again
+FAILURE_TTL = 300
+
+
+def _param_bytes(param):
+    if isinstance(param, (int, float, complex, np.number, np.ndarray)):
+        value = np.round(np.asarray(param, dtype=np.complex128), PARAM_PRECISION) + 0.0
+        return repr(value.shape).encode() + value.tobytes()
+    # Symbolic parameters (ParameterExpression) and anything else
+    return repr(param).encode()
+
+
+def circuit_key(qc, style=DIAGRAM_STYLE):
+    digest = hashlib.sha256()
+    digest.update(f"{style}|{qc.num_qubits}|{qc.num_clbits}".encode())
+    for instruction in qc.data:
+        operation = instruction.operation
+        digest.update(f"|{operation.name}|{getattr(operation, 'label', None)}".encode())
+        digest.update(repr(tuple(qc.find_bit(qubit).index for qubit in instruction.qubits)).encode())
+        digest.update(repr(tuple(qc.find_bit(clbit).index for clbit in instruction.clbits)).encode())
+        for param in operation.params:
+            digest.update(_param_bytes(param))
+    return digest.hexdigest()
+
+
+def render_circuit_svg(qc, style=DIAGRAM_STYLE):
+    # Returns (svg, None), or (None, reason) when the mpl drawer fails, e.g.
+    # because its optional pylatexenc dependency is missing
+    import matplotlib.pyplot as plt
+
+    fig = None
+    try:
+        fig = qc.draw(output="mpl", style=style)
+        buffer = io.StringIO()
+        fig.savefig(buffer, format="svg", bbox_inches="tight")
+    except Exception as error:
+        logger.warning("mpl circuit drawer failed; falling back to text", exc_info=True)
+        return None, f"{type(error).__name__}: {error}"
+    finally:
+        # qc.draw registers the figure with pyplot; never leave it open
+        if fig is not None:
+            plt.close(fig)
+    return buffer.getvalue(), None
+
+
+class CircuitDiagramCache(ImageCache):
+    # Entries are (svg, reason, rendered_at). The render time lives in the
+    # entry itself, so it is read under the LRU's lock and goes away whenever
+    # the entry is evicted or discarded.
+    def __init__(self, max_bytes=32 * 1024 * 1024, style=DIAGRAM_STYLE, render=render_circuit_svg,
+                 failure_ttl=FAILURE_TTL):
+        super().__init__(max_bytes, self._render_entry)
+        self._render_diagram = render
+        self.style = style
+        self.failure_ttl = failure_ttl
+
+    def _render_entry(self, qc, style):
+        svg, reason = self._render_diagram(qc, style)
+        return svg, reason, time.monotonic()
+
+    def _size(self, value):
+        svg, reason, _ = value
+        return len(svg if svg is not None else reason)
+
+    def key(self, qc):
+        return circuit_key(qc, self.style)
+
+    def get(self, qc):
+        key = self.key(qc)
+        svg, reason, rendered_at = self._get(key, qc, self.style)
+        if svg is None and time.monotonic() - rendered_at >= self.failure_ttl:
+            # The failure has expired: drop it and try the mpl path again
+            self.discard(key)
+            svg, reason, _ = self._get(key, qc, self.style)
+        return svg, reason
+
+    def failures(self):
+        # Why the mpl path failed, for every cached circuit it failed on
+        with self._lock:
+            return {key: reason for key, (svg, reason, _) in self._entries.items() if svg is None}
+
+
+CIRCUIT_CACHE = CircuitDiagramCache()
+
+
+def circuit_svg(qc):
+    return CIRCUIT_CACHE.get(qc)
@@ -0,0 +1,187 @@
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from quantum_engine import ISOLATOR_ROTATION
+
+# Frame renderer for the Faraday propagation animation and the
+# parameter-space heatmaps. Figures are built through the object-oriented
+# API (not pyplot), so they are never registered globally and need no
+# plt.close().
+
+
+class FaradayRenderer:
+    # The figure, axes, labels, grid and reference arrows are drawn once
+    # into a cached Agg background; each frame only updates and redraws the
+    # moving artists (E-field line, quiver, current arrow, arc and texts).
+
+    def __init__(self, initial_angle, magnetic_field, dpi=100, blit=True):
+        self.initial_angle = initial_angle
+        self.fig = Figure(figsize=(14, 6), dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self._background = None
+        self._animated = False
+
+        initial_rad = np.deg2rad(initial_angle)
+        self._z = np.linspace(0, 2*np.pi, 100)
+        self._sin_z = np.sin(self._z)
+
+        # 3D wave visualization
+        self.ax1 = self.fig.add_subplot(121, projection='3d')
+        (self.wave,) = self.ax1.plot(np.cos(initial_rad) * self._sin_z,
+                                     np.sin(initial_rad) * self._sin_z,
+                                     self._z, 'b-', linewidth=2.5, label='E-field', alpha=0.8)
+        self.quiver = None
+        self._set_quiver(initial_rad, initial_angle)
+
+        self.ax1.set_xlabel('Ex (H)', fontsize=11, fontweight='bold')
+        self.ax1.set_ylabel('Ey (V)', fontsize=11, fontweight='bold')
+        self.ax1.set_zlabel('Propagation', fontsize=11, fontweight='bold')
+        self.wave_title = self.ax1.set_title('Light Wave\nDistance: 0.0 cm',
+                                             fontsize=13, fontweight='bold', color='#667eea')
+        self.ax1.set_xlim([-1.5, 1.5])
+        self.ax1.set_ylim([-1.5, 1.5])
+        self.ax1.set_zlim([0, 2*np.pi])
+        self.wave_legend = self.ax1.legend(loc='upper right', fontsize=9)
+        self.ax1.view_init(elev=20, azim=45)
+        self.ax1.grid(True, alpha=0.3)
+
+        # Polarization plane view
+        self.ax2 = self.fig.add_subplot(122)
+        self.ax2.set_aspect('equal')
+
+        self.ax2.arrow(0, 0, 1.2, 0, head_width=0.1, head_length=0.1,
+                       fc='gray', ec='gray', alpha=0.3)
+        self.ax2.arrow(0, 0, 0, 1.2, head_width=0.1, head_length=0.1,
+                       fc='gray', ec='gray', alpha=0.3)
+        self.ax2.text(1.35, 0, 'H', fontsize=13, ha='left', va='center', fontweight='bold')
+        self.ax2.text(0, 1.35, 'V', fontsize=13, ha='center', va='bottom', fontweight='bold')
+
+        self.ax2.arrow(0, 0, np.cos(initial_rad), np.sin(initial_rad),
+                       head_width=0.15, head_length=0.15,
+                       fc='blue', ec='blue', alpha=0.3, linewidth=2.5,
+                       label=f'Initial: {initial_angle}°')
+        self.current_arrow = self.ax2.arrow(0, 0, np.cos(initial_rad), np.sin(initial_rad),
+                                            head_width=0.15, head_length=0.15,
+                                            fc='red', ec='red', alpha=1.0, linewidth=3.5,
+                                            label=f'Current: {initial_angle:.1f}°')
+
+        (self.arc,) = self.ax2.plot([], [], 'g--', linewidth=2.5, alpha=0.8)
+        self.rotation_text = self.ax2.text(0, -0.8, '',
+                                           fontsize=12, ha='center', color='green',
+                                           fontweight='bold', bbox=dict(boxstyle='round',
+                                           facecolor='lightgreen', alpha=0.5))
+
+        self.ax2.set_xlim([-1.6, 1.6])
+        self.ax2.set_ylim([-1.6, 1.6])
+        self.ax2.set_title(f'Polarization Plane\nB = {magnetic_field:.1f} T',
+                           fontsize=13, fontweight='bold', color='#667eea')
+        self.plane_legend = self.ax2.legend(loc='upper right', fontsize=10)
+        self.ax2.grid(True, alpha=0.3, linestyle='--')
+        self.ax2.axhline(y=0, color='k', linewidth=0.8, alpha=0.3)
+        self.ax2.axvline(x=0, color='k', linewidth=0.8, alpha=0.3)
+
+        self.fig.tight_layout()
+
+        self.blit = blit and hasattr(self.canvas, 'copy_from_bbox')
+        if self.blit:
+            self._animated = True
+            for artist in self._dynamic_artists():
+                artist.set_animated(True)
+
+    def _dynamic_artists(self):
+        return [self.wave, self.quiver, self.wave_title, self.wave_legend,
+                self.current_arrow, self.arc, self.rotation_text, self.plane_legend]
+
+    def _set_quiver(self, angle_rad, pol_angle):
+        # A 3D quiver cannot be re-aimed in place, so it is swapped out
+        if self.quiver is not None:
+            self.quiver.remove()
+        arrow_length = 1.2
+        self.quiver = self.ax1.quiver(0, 0, 0,
+                                      arrow_length * np.cos(angle_rad),
+                                      arrow_length * np.sin(angle_rad),
+                                      0,
+                                      color='red', arrow_length_ratio=0.3, linewidth=4,
+                                      label=f'Pol: {pol_angle:.1f}°')
+        self.quiver.set_animated(self._animated)
+
+    def update(self, rotation_angle, current_distance):
+        current_pol_angle = self.initial_angle + rotation_angle
+        angle_rad = np.deg2rad(current_pol_angle)
+
+        self.wave.set_data_3d(np.cos(angle_rad) * self._sin_z,
+                              np.sin(angle_rad) * self._sin_z,
+                              self._z)
+        self._set_quiver(angle_rad, current_pol_angle)
+        self.wave_title.set_text(f'Light Wave\nDistance: {current_distance*100:.1f} cm')
+        self.wave_legend.texts[1].set_text(f'Pol: {current_pol_angle:.1f}°')
+
+        self.current_arrow.set_data(dx=np.cos(angle_rad), dy=np.sin(angle_rad))
+        self.plane_legend.texts[1].set_text(f'Current: {current_pol_angle:.1f}°')
+
+        if rotation_angle > 0:
+            arc_angles = np.linspace(np.deg2rad(self.initial_angle), angle_rad, 50)
+            self.arc.set_data(0.5 * np.cos(arc_angles), 0.5 * np.sin(arc_angles))
+            self.rotation_text.set_text(f'Rotation: {rotation_angle:.1f}°')
+        self.arc.set_visible(rotation_angle > 0)
+        self.rotation_text.set_visible(rotation_angle > 0)
+
+    def render(self, rotation_angle, current_distance):
+        # Returns the frame as an (H, W, 4) uint8 RGBA array
+        self.update(rotation_angle, current_distance)
+
+        if not self.blit:
+            self.canvas.draw()
+        else:
+            if self._background is None:
+                # Static layer: everything except the animated artists
+                self.canvas.draw()
+                self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+            self.canvas.restore_region(self._background)
+            renderer = self.canvas.get_renderer()
+            self.quiver.do_3d_projection()
+            for artist in self._dynamic_artists():
+                if artist.get_visible():
+                    artist.draw(renderer)
+
+        return np.asarray(self.canvas.buffer_rgba()).copy()
+
+
+def draw_parameter_map(x, y, rotation_deg, intensity, x_label, y_label, analyzer_angle, marker=None):
+    # Heatmaps of one (x, y) slice of the Faraday grid: the polarization
+    # rotation modulo 180° (cyclic colormap) and the intensity through the
+    # analyzer. Both carry the isolator contours θ = 45° + k·90°, where the
+    # doubled return-pass rotation 2θ is an odd multiple of 90°.
+    fig = Figure(figsize=(14, 5.5), dpi=100)
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(1, 2)
+    extent = [x[0], x[-1], y[0], y[-1]]
+
+    # Every k whose contour falls inside the data, negative rotations included
+    k_min = np.ceil((rotation_deg.min() - ISOLATOR_ROTATION) / 90)
+    k_max = np.floor((rotation_deg.max() - ISOLATOR_ROTATION) / 90)
+    levels = ISOLATOR_ROTATION + 90 * np.arange(k_min, k_max + 1)
+
+    maps = (
+        (rotation_deg % 180, 'twilight', 180, 'Polarization rotation (mod 180°)'),
+        (intensity, 'viridis', 1, f'Transmitted intensity I/I₀ (analyzer at {analyzer_angle}°)'),
+    )
+    for ax, (data, cmap, vmax, title) in zip(axes, maps):
+        # Slices are indexed [x, y]; imshow wants rows along y
+        image = ax.imshow(data.T, origin='lower', extent=extent, aspect='auto',
+                          cmap=cmap, vmin=0, vmax=vmax, interpolation='nearest')
+        fig.colorbar(image, ax=ax)
+        if levels.size:
+            ax.contour(x, y, rotation_deg.T, levels=levels, colors='red', linewidths=1.2)
+            ax.plot([], [], color='red', linewidth=1.2, label='Isolator condition θ = 45° + k·90°')
+        if marker is not None:
+            ax.plot(*marker, marker='*', color='white', markeredgecolor='black', markersize=16,
+                    linestyle='none', label='Current settings')
+        ax.set_xlabel(x_label, fontsize=11, fontweight='bold')
+        ax.set_ylabel(y_label, fontsize=11, fontweight='bold')
+        ax.set_title(title, fontsize=12, fontweight='bold', color='#667eea')
+        ax.legend(loc='upper right', fontsize=9, framealpha=0.85)
+
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,119 @@
+import numpy as np
+
+from quantum_engine import GATES, _as_state
+
+# Mixed-state (density matrix) simulation with Kraus noise channels.
+# Every channel builder is vectorized over the noise strength: for M
+# strengths it returns Kraus operators of shape (M, K, d, d), and
+# apply_channel() maps a whole batch of density matrices through them with
+# a single einsum, so a sweep over hundreds of strengths is one call.
+
+_I = GATES["Identity"]
+_X = GATES["X (NOT)"]
+_Y = GATES["Y"]
+_Z = GATES["Z"]
+
+CHANNELS = ["Depolarizing", "Amplitude damping", "Phase damping", "Collective dephasing"]
+
+
+def density_matrix(state):
+    # |ψ⟩⟨ψ| for a single state (d,) or a batch (..., d)
+    state = np.asarray(state, dtype=np.complex128)
+    return state[..., :, None] * state[..., None, :].conj()
+
+
+def _strengths(p):
+    p = np.asarray(p, dtype=np.float64)
+    if np.any((p < 0) | (p > 1)):
+        raise ValueError("noise strength must be between 0 and 1")
+    return p.reshape(-1)
+
+
+def depolarizing(p):
+    # ρ -> (1 - p) ρ + p I/2
+    p = _strengths(p)[:, None, None, None]
+    weights = np.concatenate([np.sqrt(1 - 3 * p / 4), np.broadcast_to(np.sqrt(p / 4), (p.shape[0], 3, 1, 1))], axis=1)
+    return weights * np.stack([_I, _X, _Y, _Z])
+
+
+def amplitude_damping(gamma):
+    # Energy relaxation |1⟩ -> |0⟩ with probability γ (T1)
+    gamma = _strengths(gamma)
+    kraus = np.zeros((gamma.size, 2, 2, 2), dtype=np.complex128)
+    kraus[:, 0, 0, 0] = 1
+    kraus[:, 0, 1, 1] = np.sqrt(1 - gamma)
+    kraus[:, 1, 0, 1] = np.sqrt(gamma)
+    return kraus
+
+
+def phase_damping(lam):
+    # Loss of phase coherence without energy loss (T2): off-diagonals
+    # shrink by sqrt(1 - λ)
+    lam = _strengths(lam)
+    kraus = np.zeros((lam.size, 2, 2, 2), dtype=np.complex128)
+    kraus[:, 0, 0, 0] = 1
+    kraus[:, 0, 1, 1] = np.sqrt(1 - lam)
+    kraus[:, 1, 1, 1] = np.sqrt(lam)
+    return kraus
+
+
+def collective_dephasing(p, num_qubits=1):
+    # Every qubit sees the same phase flip: Z⊗...⊗Z with probability p. The
+    # subspace spanned by |01⟩ and |10⟩ only picks up a global sign, which is
+    # what makes it decoherence-free.
+    p = _strengths(p)[:, None, None, None]
+    z_all = _Z
+    for _ in range(num_qubits - 1):
+        z_all = np.kron(z_all, _Z)
+    return np.concatenate([np.sqrt(1 - p), np.sqrt(p)], axis=1) * np.stack([np.eye(2 ** num_qubits), z_all])
+
+
+def channel_kraus(channel, strengths, num_qubits=1):
+    if channel == "Depolarizing":
+        return depolarizing(strengths)
+    if channel == "Amplitude damping":
+        return amplitude_damping(strengths)
+    if channel == "Phase damping":
+        return phase_damping(strengths)
+    if channel == "Collective dephasing":
+        return collective_dephasing(strengths, num_qubits)
+    raise ValueError(f"Unknown channel: {channel!r}")
+
+
+def apply_channel(rho, kraus):
+    # ρ' = Σ_k K_k ρ K_k†. `kraus` is (M, K, d, d) and `rho` either one
+    # (d, d) matrix or a matching (M, d, d) batch.
+    rho = np.broadcast_to(rho, kraus.shape[:1] + kraus.shape[2:])
+    return np.einsum("mkij,mjl,mknl->min", kraus, rho, kraus.conj(), optimize=True)
+
+
+def density_bloch_vector(rho):
+    # ρ = (I + r·σ)/2, so r = (2 Re ρ10, 2 Im ρ10, ρ00 - ρ11); |r| < 1 for
+    # mixed states
+    rho = np.asarray(rho)
+    coherence = rho[..., 1, 0]
+    return np.stack([2 * coherence.real, 2 * coherence.imag, (rho[..., 0, 0] - rho[..., 1, 1]).real], axis=-1)
+
+
+def purity(rho):
+    # Tr(ρ²) without forming ρ²: the sum of |ρ_ij|² for Hermitian ρ
+    return np.sum(np.abs(rho) ** 2, axis=(-2, -1))
+
+
+def fidelity(state, rho):
+    # ⟨ψ|ρ|ψ⟩ against a pure reference state
+    state = np.asarray(state, dtype=np.complex128)
+    return np.einsum("i,...ij,j->...", state.conj(), rho, state).real
+
+
+def noise_sweep(initial_state, channel, strengths):
+    # One channel applied to one qubit state for every strength at once
+    state = _as_state(initial_state)
+    rho = apply_channel(density_matrix(state), channel_kraus(channel, strengths))
+    return {
+        "strengths": _strengths(strengths),
+        "rho": rho,
+        "bloch": density_bloch_vector(rho),
+        "purity": purity(rho),
+        "fidelity": fidelity(state, rho),
+    }
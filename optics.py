@@ -0,0 +1,194 @@
+import numpy as np
+
+# Jones-calculus engine for chains of polarization optics. Every element is
+# a 2x2 Jones matrix in a fixed lab (x, y) frame, or a (..., 2, 2) stack of
+# them when its angle is an array. Light can cross a chain in either
+# direction: reciprocal elements (polarizers, wave plates) act through their
+# transpose on the way back, while a Faraday rotator turns the polarization
+# the same way in both directions because the rotation follows B, not the
+# beam. That non-reciprocity is what makes isolators and Faraday mirrors
+# work.
+
+
+def _matrix(a, b, c, d):
+    # (..., 2, 2) Jones matrices [[a, b], [c, d]] from broadcastable entries
+    a, b, c, d = np.broadcast_arrays(*(np.asarray(x, dtype=np.complex128) for x in (a, b, c, d)))
+    return np.stack([np.stack([a, b], axis=-1), np.stack([c, d], axis=-1)], axis=-2)
+
+
+def polarizer(angle):
+    # Linear polarizer with its transmission axis at `angle` degrees
+    theta = np.deg2rad(angle)
+    c, s = np.cos(theta), np.sin(theta)
+    return _matrix(c * c, c * s, c * s, s * s)
+
+
+def retarder(retardance, angle):
+    # Wave plate with its fast axis at `angle` degrees, delaying the slow
+    # axis by `retardance` radians
+    theta = np.deg2rad(angle)
+    c, s = np.cos(theta), np.sin(theta)
+    delay = np.exp(1j * np.asarray(retardance))
+    return _matrix(c * c + delay * s * s, (1 - delay) * c * s, (1 - delay) * c * s, s * s + delay * c * c)
+
+
+def half_wave_plate(angle):
+    return retarder(np.pi, angle)
+
+
+def quarter_wave_plate(angle):
+    return retarder(np.pi / 2, angle)
+
+
+def faraday_rotator(rotation):
+    # Turns linear polarization by `rotation` degrees (θ = V·B·L)
+    theta = np.deg2rad(rotation)
+    c, s = np.cos(theta), np.sin(theta)
+    return _matrix(c, -s, s, c)
+
+
+def mirror(angle=None):
+    # Ideal mirror at normal incidence; it has no orientation, so `angle` is
+    # ignored. Both field components pick up the same π phase.
+    return -np.eye(2, dtype=np.complex128)
+
+
+ELEMENT_TYPES = {
+    "Polarizer": polarizer,
+    "Half-wave plate": half_wave_plate,
+    "Quarter-wave plate": quarter_wave_plate,
+    "Faraday rotator": faraday_rotator,
+    "Mirror": mirror,
+}
+
+# Elements whose action does not reverse with the propagation direction
+NONRECIPROCAL = ("Faraday rotator",)
+
+CHAIN_PRESETS = {
+    "Optical isolator": [("Polarizer", 0.0), ("Faraday rotator", 45.0), ("Polarizer", 45.0)],
+    "Faraday mirror (double pass)": [("Faraday rotator", 45.0), ("Mirror", 0.0)],
+    "Quarter-wave plate (double pass)": [("Quarter-wave plate", 45.0), ("Mirror", 0.0)],
+    "Half-wave plate": [("Half-wave plate", 22.5)],
+}
+
+
+def element_matrices(kind, angle):
+    # (forward, backward) Jones matrices of one element
+    if kind not in ELEMENT_TYPES:
+        raise ValueError(f"Unknown optical element: {kind!r}")
+    forward = ELEMENT_TYPES[kind](angle)
+    backward = forward if kind in NONRECIPROCAL else np.swapaxes(forward, -1, -2)
+    return forward, backward
+
+
+def propagate(jones, inputs):
+    # Apply (..., 2, 2) matrices to (..., 2) Jones vectors, broadcasting both
+    inputs = np.asarray(inputs, dtype=np.complex128)
+    return np.einsum("...ij,...j->...i", jones, inputs)
+
+
+def intensity(jones_vectors):
+    return np.sum(np.abs(jones_vectors) ** 2, axis=-1)
+
+
+def isolation_db(forward_transmission, backward_transmission, floor=1e-12):
+    # How much more light gets through forward than backward
+    return 10 * np.log10(np.maximum(forward_transmission, floor) / np.maximum(backward_transmission, floor))
+
+
+class OpticalChain:
+    # Ordered elements from the input side to the far end. The cumulative
+    # products of the first k elements are cached for both directions:
+    #   forward  P_k = J_k ... J_2 J_1
+    #   backward Q_k = J_1ᵀ J_2ᵀ ... J_kᵀ   (light entering at element k)
+    # Changing element i only invalidates the products that contain it,
+    # P_i..P_n and Q_i..Q_n, so elements upstream of it are never recomputed.
+
+    def __init__(self, elements=()):
+        self.elements = []
+        self._matrices = []
+        self._forward = []
+        self._backward = []
+        self._valid = 0
+        # Number of elements folded into the cached products by the last
+        # evaluation, for checking how much a change cost
+        self.recomputed = 0
+        for kind, angle in elements:
+            self.append(kind, angle)
+
+    def __len__(self):
+        return len(self.elements)
+
+    def _invalidate(self, index):
+        self._valid = min(self._valid, index)
+        del self._forward[index:]
+        del self._backward[index:]
+
+    def append(self, kind, angle=0.0):
+        self.insert(len(self.elements), kind, angle)
+
+    def insert(self, index, kind, angle=0.0):
+        self.elements.insert(index, (kind, angle))
+        self._matrices.insert(index, element_matrices(kind, angle))
+        self._invalidate(index)
+
+    def remove(self, index):
+        del self.elements[index]
+        del self._matrices[index]
+        self._invalidate(index)
+
+    def set(self, index, kind, angle=0.0):
+        if self.elements[index][0] == kind and np.array_equal(self.elements[index][1], angle):
+            return
+        self.elements[index] = (kind, angle)
+        self._matrices[index] = element_matrices(kind, angle)
+        self._invalidate(index)
+
+    def set_elements(self, elements):
+        # Replace the whole chain, keeping the cached products of the longest
+        # unchanged prefix
+        elements = list(elements)
+        for index, (kind, angle) in enumerate(elements[:len(self.elements)]):
+            self.set(index, kind, angle)
+        while len(self.elements) > len(elements):
+            self.remove(len(self.elements) - 1)
+        for kind, angle in elements[len(self.elements):]:
+            self.append(kind, angle)
+
+    def _products(self):
+        self.recomputed = len(self.elements) - self._valid
+        for index in range(self._valid, len(self.elements)):
+            forward, backward = self._matrices[index]
+            if index == 0:
+                self._forward.append(forward)
+                self._backward.append(backward)
+            else:
+                self._forward.append(forward @ self._forward[-1])
+                self._backward.append(self._backward[-1] @ backward)
+        self._valid = len(self.elements)
+
+    def matrix(self, direction="forward", upto=None):
+        # Jones matrix of the first `upto` elements (all by default)
+        upto = len(self.elements) if upto is None else upto
+        if upto == 0:
+            return np.eye(2, dtype=np.complex128)
+        self._products()
+        if direction == "forward":
+            return self._forward[upto - 1]
+        if direction == "backward":
+            return self._backward[upto - 1]
+        raise ValueError(f"Unknown direction: {direction!r}")
+
+    def double_pass_matrix(self):
+        # Through the chain, off the mirror that ends it, and back through
+        # everything before the mirror
+        if not self.elements or self.elements[-1][0] != "Mirror":
+            raise ValueError("A double pass needs a mirror as the last element")
+        return self.matrix("backward", len(self.elements) - 1) @ self.matrix("forward")
+
+    def evaluate(self, inputs, direction="forward"):
+        # Output Jones vectors for a batch of (..., 2) inputs; `direction` is
+        # "forward", "backward" or "double pass"
+        if direction == "double pass":
+            return propagate(self.double_pass_matrix(), inputs)
+        return propagate(self.matrix(direction), inputs)
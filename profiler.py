@@ -0,0 +1,178 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# Stage timings for the app: how long circuit construction, simulation,
+# Bloch and circuit rendering, st.pyplot/st.image transfers and animation
+# pacing take in each tab. tab_state.stage() records every timed stage twice,
+# into the session's own StageTimings and into PROCESS_TIMINGS, which every
+# session of this server process shares. This module does not import
+# Streamlit, so the process view can be exported from anywhere:
+#   QUBIT_GATES_METRICS_PORT=9108         Prometheus text on :9108/metrics,
+#                                          the same as JSON on /metrics.json
+#   QUBIT_GATES_METRICS_HOST=0.0.0.0      interface to bind; the endpoint has
+#                                          no authentication, so the default
+#                                          is 127.0.0.1
+#   QUBIT_GATES_METRICS_LOG_SECONDS=60    one JSON line on stderr every minute
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Samples kept per (tab, stage) for the quantiles; counts and sums cover
+# every sample ever recorded
+PROCESS_WINDOW = 5000
+
+METRIC_NAME = "qubit_gates_stage_seconds"
+
+
+class StageTimings:
+    # Thread-safe (tab, stage) -> recent durations in seconds, plus running
+    # count and sum
+    def __init__(self, window=PROCESS_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._totals = {}
+
+    def record(self, tab, stage, seconds):
+        key = (tab, stage)
+        with self._lock:
+            if key not in self._samples:
+                self._samples[key] = deque(maxlen=self.window)
+                self._totals[key] = [0, 0.0]
+            self._samples[key].append(seconds)
+            totals = self._totals[key]
+            totals[0] += 1
+            totals[1] += seconds
+
+    def snapshot(self):
+        # [(tab, stage, count, sum, quantiles)] in first-recorded order
+        with self._lock:
+            entries = [(key, np.array(samples), *self._totals[key]) for key, samples in self._samples.items()]
+        return [(tab, stage, count, total, np.quantile(samples, QUANTILES))
+                for (tab, stage), samples, count, total in entries]
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+
+
+PROCESS_TIMINGS = StageTimings()
+
+
+def summary_rows(timings):
+    # Table rows for the debug panel, times in ms
+    rows = []
+    for tab, stage, count, total, quantiles in timings.snapshot():
+        row = {"Tab": tab, "Stage": stage, "Count": count}
+        for q, value in zip(QUANTILES, quantiles):
+            row[f"p{q * 100:g} (ms)"] = round(float(value) * 1e3, 2)
+        row["Total (s)"] = round(total, 3)
+        rows.append(row)
+    return rows
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(timings=PROCESS_TIMINGS):
+    # Prometheus text exposition format, one summary per (tab, stage)
+    lines = [
+        f"# HELP {METRIC_NAME} Time spent in each stage of the app's tabs.",
+        f"# TYPE {METRIC_NAME} summary",
+    ]
+    for tab, stage, count, total, quantiles in timings.snapshot():
+        labels = f'tab="{_label(tab)}",stage="{_label(stage)}"'
+        for q, value in zip(QUANTILES, quantiles):
+            lines.append(f'{METRIC_NAME}{{{labels},quantile="{q:g}"}} {value:.9g}')
+        lines.append(f"{METRIC_NAME}_sum{{{labels}}} {total:.9g}")
+        lines.append(f"{METRIC_NAME}_count{{{labels}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def metrics_json(timings=PROCESS_TIMINGS):
+    # The same numbers as one JSON line, for log pipelines
+    return json.dumps({
+        "time": round(time.time(), 3),
+        "pid": os.getpid(),
+        "stages": [
+            {"tab": tab, "stage": stage, "count": count, "sum_s": round(total, 6),
+             **{f"p{q * 100:g}_ms": round(float(value) * 1e3, 3) for q, value in zip(QUANTILES, quantiles)}}
+            for tab, stage, count, total, quantiles in timings.snapshot()
+        ],
+    }, ensure_ascii=False)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = prometheus_text(), "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path == "/metrics.json":
+            body, content_type = metrics_json(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_exporters = {}
+_exporters_lock = threading.Lock()
+
+
+def serve_metrics(port, host="127.0.0.1"):
+    # Background HTTP server for PROCESS_TIMINGS; one per process, however
+    # often the app script calls this. Returns None if the port is taken.
+    with _exporters_lock:
+        if "server" not in _exporters:
+            try:
+                server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError:
+                logger.warning("Could not serve stage metrics on port %d", port, exc_info=True)
+                server = None
+            else:
+                threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+                logger.info("Serving stage metrics on http://%s:%d/metrics", host, server.server_port)
+            _exporters["server"] = server
+        return _exporters["server"]
+
+
+def log_metrics_every(seconds):
+    # Background thread writing metrics_json() to stderr, next to the
+    # server's own log, every `seconds`
+    def run():
+        while True:
+            time.sleep(seconds)
+            print(metrics_json(), file=sys.stderr, flush=True)
+
+    with _exporters_lock:
+        if "log" not in _exporters:
+            _exporters["log"] = threading.Thread(target=run, name="metrics-log", daemon=True)
+            _exporters["log"].start()
+
+
+def start_exporters():
+    # Starts whichever exporters the environment asks for
+    port = os.environ.get("QUBIT_GATES_METRICS_PORT")
+    if port:
+        serve_metrics(int(port), os.environ.get("QUBIT_GATES_METRICS_HOST", "127.0.0.1"))
+    interval = os.environ.get("QUBIT_GATES_METRICS_LOG_SECONDS")
+    if interval:
+        log_metrics_every(float(interval))
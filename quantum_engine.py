@@ -0,0 +1,310 @@
+import numpy as np
+
+# Headless simulation core for the UI tabs: state preparation, gates,
+# rotations, the Faraday rotator and the Jones/Bloch mapping. Nothing here
+# imports Streamlit, so every function can be reused or timed on its own.
+# States and gates are precomputed complex128 arrays so a simulation is a
+# plain 2x2 matrix-vector product; Qiskit is only imported for the optional
+# cross-check backend and for circuit diagrams.
+
+_R2 = 1 / np.sqrt(2)
+
+INITIAL_STATES = {
+    "|0⟩": np.array([1, 0], dtype=np.complex128),
+    "|1⟩": np.array([0, 1], dtype=np.complex128),
+    "|+⟩": np.array([_R2, _R2], dtype=np.complex128),
+    "|-⟩": np.array([_R2, -_R2], dtype=np.complex128),
+}
+
+GATES = {
+    "Identity": np.eye(2, dtype=np.complex128),
+    "X (NOT)": np.array([[0, 1], [1, 0]], dtype=np.complex128),
+    "Y": np.array([[0, -1j], [1j, 0]], dtype=np.complex128),
+    "Z": np.array([[1, 0], [0, -1]], dtype=np.complex128),
+    "H (Hadamard)": np.array([[_R2, _R2], [_R2, -_R2]], dtype=np.complex128),
+    "S (Phase)": np.array([[1, 0], [0, 1j]], dtype=np.complex128),
+    "T": np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]], dtype=np.complex128),
+    "S† (S-dagger)": np.array([[1, 0], [0, -1j]], dtype=np.complex128),
+    "T† (T-dagger)": np.array([[1, 0], [0, np.exp(-1j * np.pi / 4)]], dtype=np.complex128),
+}
+
+for _array in list(INITIAL_STATES.values()) + list(GATES.values()):
+    _array.setflags(write=False)
+
+# Qiskit instructions that reproduce each state / gate on qubit 0
+INITIAL_STATE_OPS = {
+    "|0⟩": [],
+    "|1⟩": ["x"],
+    "|+⟩": ["h"],
+    "|-⟩": ["x", "h"],
+}
+
+GATE_OPS = {
+    "Identity": [],
+    "X (NOT)": ["x"],
+    "Y": ["y"],
+    "Z": ["z"],
+    "H (Hadamard)": ["h"],
+    "S (Phase)": ["s"],
+    "T": ["t"],
+    "S† (S-dagger)": ["sdg"],
+    "T† (T-dagger)": ["tdg"],
+}
+
+
+def prepare_state(initial_state):
+    return INITIAL_STATES[initial_state].copy()
+
+
+def apply_gate(gate, state):
+    return GATES[gate] @ state
+
+
+def simulate_gate(initial_state, gate, backend="numpy"):
+    if backend == "numpy":
+        return GATES[gate] @ INITIAL_STATES[initial_state]
+    if backend == "qiskit":
+        from qiskit.quantum_info import Statevector
+        return np.asarray(Statevector.from_instruction(build_circuit(initial_state, gate)).data)
+    raise ValueError(f"Unknown backend: {backend!r}")
+
+
+def build_circuit(initial_state, gate=None):
+    from qiskit import QuantumCircuit
+
+    qc = QuantumCircuit(1)
+    for op in INITIAL_STATE_OPS[initial_state]:
+        getattr(qc, op)(0)
+    if gate is not None:
+        for op in GATE_OPS[gate]:
+            getattr(qc, op)(0)
+    return qc
+
+
+def state_metrics(state):
+    probabilities = np.abs(state) ** 2
+    return {
+        "alpha": state[0],
+        "beta": state[1],
+        "p0": float(probabilities[0]),
+        "p1": float(probabilities[1]),
+        "phase": float(np.angle(state[1])),
+    }
+
+
+def cross_check(initial_state, gate, atol=1e-10):
+    # Compare the native result against Qiskit's Statevector simulation
+    native = simulate_gate(initial_state, gate)
+    reference = simulate_gate(initial_state, gate, backend="qiskit")
+    return bool(np.allclose(native, reference, atol=atol))
+
+
+def bloch_vector(state):
+    # Works for a single (2,) state or a batch of shape (N, 2)
+    state = np.asarray(state)
+    alpha, beta = state[..., 0], state[..., 1]
+    coherence = np.conj(alpha) * beta
+    return np.stack([
+        2 * coherence.real,
+        2 * coherence.imag,
+        np.abs(alpha) ** 2 - np.abs(beta) ** 2,
+    ], axis=-1)
+
+
+def _as_state(state):
+    if isinstance(state, str):
+        return INITIAL_STATES[state]
+    return np.asarray(state, dtype=np.complex128)
+
+
+def rotation_matrix(axis, angle):
+    c, s = np.cos(angle / 2), np.sin(angle / 2)
+    if axis == "X":
+        return np.array([[c, -1j * s], [-1j * s, c]], dtype=np.complex128)
+    if axis == "Y":
+        return np.array([[c, -s], [s, c]], dtype=np.complex128)
+    if axis == "Z":
+        return np.array([[np.exp(-0.5j * angle), 0], [0, np.exp(0.5j * angle)]], dtype=np.complex128)
+    raise ValueError(f"Unknown rotation axis: {axis!r}")
+
+
+ROTATION_AXES = ["X", "Y", "Z"]
+
+
+def rotate_batch(state, axis, angles):
+    # Closed-form Rx/Ry/Rz applied to one state for every angle at once.
+    # Returns the (N, 2) amplitudes and the matching (N, 3) Bloch vectors.
+    alpha, beta = _as_state(state)
+    angles = np.asarray(angles, dtype=np.float64).reshape(-1)
+    c, s = np.cos(angles / 2), np.sin(angles / 2)
+
+    amplitudes = np.empty((angles.size, 2), dtype=np.complex128)
+    if axis == "X":
+        amplitudes[:, 0] = c * alpha - 1j * s * beta
+        amplitudes[:, 1] = c * beta - 1j * s * alpha
+    elif axis == "Y":
+        amplitudes[:, 0] = c * alpha - s * beta
+        amplitudes[:, 1] = s * alpha + c * beta
+    elif axis == "Z":
+        phase = np.exp(-0.5j * angles)
+        amplitudes[:, 0] = phase * alpha
+        amplitudes[:, 1] = np.conj(phase) * beta
+    else:
+        raise ValueError(f"Unknown rotation axis: {axis!r}")
+    return amplitudes, bloch_vector(amplitudes)
+
+
+def rotate_each(states, axes, angles):
+    # One rotation per state: states[i] goes through R_axes[i](angles[i]).
+    # `states` is (N, 2) and `axes` a sequence of "X"/"Y"/"Z"; returns the
+    # (N, 2) amplitudes. Used to run many independent jobs in one pass.
+    states = np.asarray(states, dtype=np.complex128)
+    axes = np.asarray(axes)
+    angles = np.asarray(angles, dtype=np.float64)
+    unknown = ~np.isin(axes, ROTATION_AXES)
+    if unknown.any():
+        raise ValueError(f"Unknown rotation axis: {axes[unknown][0]!r}")
+
+    alpha, beta = states[:, 0], states[:, 1]
+    c, s = np.cos(angles / 2), np.sin(angles / 2)
+    # Off-diagonal terms: -i·s on both sides for X, -s / +s for Y
+    upper = np.where(axes == "X", -1j * s, -s)
+    lower = np.where(axes == "X", -1j * s, s)
+    z = axes == "Z"
+    phase = np.exp(-0.5j * angles)
+
+    amplitudes = np.empty_like(states)
+    amplitudes[:, 0] = np.where(z, phase * alpha, c * alpha + upper * beta)
+    amplitudes[:, 1] = np.where(z, np.conj(phase) * beta, lower * alpha + c * beta)
+    return amplitudes
+
+
+def rotation_sweep(angles, states=None, axes=ROTATION_AXES):
+    # Every initial state x axis x angle at once: the (A, N, 2, 2) closed-form
+    # rotation matrices meet the (S, 2) states in a single einsum. Arrays in
+    # the result are indexed [state, axis, angle].
+    states = list(INITIAL_STATES) if states is None else list(states)
+    angles = np.asarray(angles, dtype=np.float64).reshape(-1)
+    c, s = np.cos(angles / 2), np.sin(angles / 2)
+    phase = np.exp(-0.5j * angles)
+
+    matrices = np.zeros((len(axes), angles.size, 2, 2), dtype=np.complex128)
+    for index, axis in enumerate(axes):
+        if axis == "X":
+            matrices[index, :, 0, 0] = matrices[index, :, 1, 1] = c
+            matrices[index, :, 0, 1] = matrices[index, :, 1, 0] = -1j * s
+        elif axis == "Y":
+            matrices[index, :, 0, 0] = matrices[index, :, 1, 1] = c
+            matrices[index, :, 0, 1] = -s
+            matrices[index, :, 1, 0] = s
+        elif axis == "Z":
+            matrices[index, :, 0, 0] = phase
+            matrices[index, :, 1, 1] = np.conj(phase)
+        else:
+            raise ValueError(f"Unknown rotation axis: {axis!r}")
+
+    amplitudes = np.einsum("anij,sj->sani", matrices, np.stack([_as_state(state) for state in states]), optimize=True)
+    p0, p1 = np.abs(amplitudes[..., 0]) ** 2, np.abs(amplitudes[..., 1]) ** 2
+    # ᾱβ gives both the relative phase arg(β/α) (a global phase, e.g. from
+    # Rz, drops out) and the Bloch x/y components, as in bloch_vector()
+    coherence = np.conj(amplitudes[..., 0]) * amplitudes[..., 1]
+    return {
+        "states": states,
+        "axes": list(axes),
+        "angles": angles,
+        "amplitudes": amplitudes,
+        "p0": p0,
+        "p1": p1,
+        "phase": np.angle(coherence),
+        "bloch": np.stack([2 * coherence.real, 2 * coherence.imag, p0 - p1], axis=-1),
+    }
+
+
+def simulate_rotation(initial_state, axis, angle):
+    amplitudes, _ = rotate_batch(initial_state, axis, [angle])
+    return amplitudes[0]
+
+
+def build_rotation_circuit(initial_state, axis, angle):
+    qc = build_circuit(initial_state)
+    getattr(qc, "r" + axis.lower())(angle, 0)
+    return qc
+
+
+# Faraday rotator: polarization presets as angles and as qubit states
+POLARIZATION_ANGLES = {
+    "Horizontal (|H⟩)": 0,
+    "Vertical (|V⟩)": 90,
+    "Diagonal (+45°)": 45,
+    "Anti-diagonal (-45°)": -45,
+}
+
+POLARIZATION_STATES = {
+    "Horizontal (|H⟩)": "|0⟩",
+    "Vertical (|V⟩)": "|1⟩",
+    "Diagonal (+45°)": "|+⟩",
+    "Anti-diagonal (-45°)": "|-⟩",
+}
+
+
+def faraday_rotation(verdet_constant, magnetic_field, path_length):
+    # θ = V·B·L in radians; broadcasts over array arguments
+    return np.multiply(np.multiply(verdet_constant, magnetic_field), path_length)
+
+
+# Slider ranges of the Faraday tab, used for the parameter-space grid
+VERDET_RANGE = (1.0, 100.0)   # rad/(T·m)
+FIELD_RANGE = (0.0, 5.0)      # T
+LENGTH_RANGE = (0.0, 1.0)     # m
+
+ISOLATOR_ROTATION = 45.0  # degrees; a double pass then turns the light 90°
+
+
+def faraday_grid(verdet_constants, magnetic_fields, path_lengths, initial_angle=0.0, analyzer_angle=90.0):
+    # Every (V, B, L) combination in one broadcast: the 1-D axes become an
+    # (nV, nB, nL) grid of rotation angles (degrees) and of the intensity
+    # transmitted through an analyzer at `analyzer_angle` (Malus's law).
+    rotation = faraday_rotation(
+        np.asarray(verdet_constants, dtype=np.float64)[:, None, None],
+        np.asarray(magnetic_fields, dtype=np.float64)[None, :, None],
+        np.asarray(path_lengths, dtype=np.float64)[None, None, :],
+    )
+    # cos² of the polarization-analyzer angle, computed in place
+    intensity = rotation + np.deg2rad(initial_angle - analyzer_angle)
+    np.cos(intensity, out=intensity)
+    np.square(intensity, out=intensity)
+    np.rad2deg(rotation, out=rotation)
+    return rotation, intensity
+
+
+def polarization_offset(rotation_deg, target=ISOLATOR_ROTATION):
+    # Signed distance from the nearest isolating rotation, in [-45, 45). The
+    # return pass doubles the rotation to 2θ, and the light is blocked when
+    # 2θ ≡ 90° (mod 180°), i.e. θ ≡ 45° (mod 90°): 135° and -45° isolate too.
+    return (np.asarray(rotation_deg) - target + 45) % 90 - 45
+
+
+def propagation_profile(faraday_angle_deg, path_length, num_steps):
+    # Rotation angle (degrees) and distance travelled for each animation step
+    rotation_angles = np.linspace(0, faraday_angle_deg, num_steps)
+    distances = np.linspace(0, path_length, num_steps)
+    return rotation_angles, distances
+
+
+def jones_vector(angle_degrees):
+    # Linear polarization at the given angle(s) as (..., 2) Jones vectors (Ex, Ey)
+    angle = np.deg2rad(angle_degrees)
+    return np.stack([np.cos(angle), np.sin(angle)], axis=-1).astype(np.complex128)
+
+
+def jones_to_bloch(jones):
+    # Treats the H/V Jones vector as a qubit state in the |0⟩/|1⟩ basis
+    jones = np.asarray(jones, dtype=np.complex128)
+    norm = np.linalg.norm(jones, axis=-1, keepdims=True)
+    return bloch_vector(jones / norm)
+
+
+def faraday_state(initial_polarization, faraday_angle_rad):
+    # Quantum state after the rotator, as shown on the Faraday tab's Bloch spheres
+    initial_state = INITIAL_STATES[POLARIZATION_STATES[initial_polarization]]
+    return initial_state, simulate_rotation(initial_state, "Z", 2 * faraday_angle_rad)
@@ -0,0 +1,306 @@
+import time
+
+import numpy as np
+
+from quantum_engine import GATES, rotation_matrix
+
+# n-qubit statevector simulator for the circuit builder. The state is one
+# flat complex128 array of 2**n amplitudes (qubit 0 is the least significant
+# bit, as in Qiskit). Gates never build a 2**n x 2**n matrix: each one
+# reshapes the state into a view that exposes the amplitude pairs it mixes
+# and updates them in place, a fixed-size block at a time, so the only
+# memory besides the state is two small scratch buffers.
+
+MAX_QUBITS = 26
+
+# Largest register for which the app offers a second, unfused run to
+# compare timings against (2^20 amplitudes = 16 MiB)
+COMPARE_MAX_QUBITS = 20
+
+# Amplitudes updated per block; sets the size of the scratch buffers
+BLOCK = 1 << 16
+
+SINGLE_QUBIT_GATES = {
+    "X": GATES["X (NOT)"],
+    "Y": GATES["Y"],
+    "Z": GATES["Z"],
+    "H": GATES["H (Hadamard)"],
+    "S": GATES["S (Phase)"],
+    "T": GATES["T"],
+    "S†": GATES["S† (S-dagger)"],
+    "T†": GATES["T† (T-dagger)"],
+}
+ROTATION_GATES = {"Rx": "X", "Ry": "Y", "Rz": "Z"}
+TWO_QUBIT_GATES = ("CNOT", "CZ", "SWAP")
+
+GATE_NAMES = list(SINGLE_QUBIT_GATES) + list(ROTATION_GATES) + list(TWO_QUBIT_GATES)
+
+# A fused single-qubit gate carries its 2x2 unitary in place of an angle
+FUSED_GATE = "U"
+
+# Qiskit method for each gate, used for diagrams and cross-checks
+QISKIT_OPS = {
+    "X": "x", "Y": "y", "Z": "z", "H": "h", "S": "s", "T": "t", "S†": "sdg", "T†": "tdg",
+    "Rx": "rx", "Ry": "ry", "Rz": "rz", "CNOT": "cx", "CZ": "cz", "SWAP": "swap",
+}
+
+
+def gate_matrix(name, param=None):
+    if name in SINGLE_QUBIT_GATES:
+        return SINGLE_QUBIT_GATES[name]
+    if name in ROTATION_GATES:
+        return rotation_matrix(ROTATION_GATES[name], param)
+    if name == FUSED_GATE:
+        return param
+    raise ValueError(f"Not a single-qubit gate: {name!r}")
+
+
+def zero_state(num_qubits):
+    if not 1 <= num_qubits <= MAX_QUBITS:
+        raise ValueError(f"num_qubits must be between 1 and {MAX_QUBITS}")
+    state = np.zeros(1 << num_qubits, dtype=np.complex128)
+    state[0] = 1
+    return state
+
+
+def _blocks(a, b):
+    # Split two equally shaped views into matching sub-views of at most
+    # BLOCK elements, slicing along the leading axes only (no copies)
+    if a.size <= BLOCK:
+        yield a, b
+    elif a.ndim == 1:
+        for start in range(0, a.shape[0], BLOCK):
+            yield a[start:start + BLOCK], b[start:start + BLOCK]
+    elif a[0].size <= BLOCK:
+        step = BLOCK // a[0].size
+        for start in range(0, a.shape[0], step):
+            yield a[start:start + step], b[start:start + step]
+    else:
+        for index in range(a.shape[0]):
+            yield from _blocks(a[index], b[index])
+
+
+def _split(state, *qubits):
+    # View the flat state as (..., 2, ..., 2, ...) with one length-2 axis per
+    # qubit; returns the view and, per qubit, where its axis is
+    num_qubits = state.size.bit_length() - 1
+    shape, axes = [], {}
+    lower = 0
+    for qubit in sorted(qubits):
+        shape[:0] = [2, 1 << (qubit - lower)]
+        lower = qubit + 1
+    shape[:0] = [1 << (num_qubits - lower)]
+    view = state.reshape(shape)
+    for position, qubit in enumerate(sorted(qubits, reverse=True)):
+        axes[qubit] = 1 + 2 * position
+    return view, axes
+
+
+def _select(view, axes, bits):
+    # Sub-view with the given qubits fixed, e.g. bits={3: 1}
+    index = [slice(None)] * view.ndim
+    for qubit, bit in bits.items():
+        index[axes[qubit]] = bit
+    return view[tuple(index)]
+
+
+class StatevectorSimulator:
+    def __init__(self, num_qubits):
+        self.num_qubits = num_qubits
+        self.state = zero_state(num_qubits)
+        self._scratch = np.empty((2, min(BLOCK, self.state.size)), dtype=np.complex128)
+
+    @property
+    def memory_bytes(self):
+        return self.state.nbytes + self._scratch.nbytes
+
+    def _mix(self, a0, a1, u):
+        # (a0, a1) <- (u00 a0 + u01 a1, u10 a0 + u11 a1), block by block
+        for b0, b1 in _blocks(a0, a1):
+            new1 = self._scratch[0, :b0.size].reshape(b0.shape)
+            term = self._scratch[1, :b0.size].reshape(b0.shape)
+            np.multiply(b0, u[1, 0], out=new1)
+            np.multiply(b1, u[1, 1], out=term)
+            new1 += term
+            b0 *= u[0, 0]
+            np.multiply(b1, u[0, 1], out=term)
+            b0 += term
+            b1[...] = new1
+
+    def _swap(self, a0, a1):
+        for b0, b1 in _blocks(a0, a1):
+            held = self._scratch[0, :b0.size].reshape(b0.shape)
+            held[...] = b0
+            b0[...] = b1
+            b1[...] = held
+
+    def apply_single(self, u, qubit):
+        view, axes = _split(self.state, qubit)
+        a0, a1 = _select(view, axes, {qubit: 0}), _select(view, axes, {qubit: 1})
+        if u[0, 1] == 0 and u[1, 0] == 0:
+            # Diagonal gates (Z, S, T, Rz, ...) only rescale each half
+            if u[0, 0] != 1:
+                a0 *= u[0, 0]
+            if u[1, 1] != 1:
+                a1 *= u[1, 1]
+        elif u[0, 0] == 0 and u[1, 1] == 0 and u[0, 1] == 1 and u[1, 0] == 1:
+            self._swap(a0, a1)
+        else:
+            self._mix(a0, a1, u)
+
+    def apply(self, name, qubits, param=None):
+        if name in TWO_QUBIT_GATES:
+            a, b = qubits
+            if a == b:
+                raise ValueError(f"{name} needs two different qubits")
+            view, axes = _split(self.state, a, b)
+            if name == "CNOT":
+                self._swap(_select(view, axes, {a: 1, b: 0}), _select(view, axes, {a: 1, b: 1}))
+            elif name == "CZ":
+                _select(view, axes, {a: 1, b: 1})[...] *= -1
+            else:
+                self._swap(_select(view, axes, {a: 0, b: 1}), _select(view, axes, {a: 1, b: 0}))
+        else:
+            self.apply_single(gate_matrix(name, param), qubits[0])
+
+    def run(self, ops):
+        for name, qubits, param in ops:
+            self.apply(name, qubits, param)
+        return self.state
+
+
+def format_bytes(num_bytes):
+    for unit in ("B", "KiB", "MiB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:,.0f} {unit}" if unit == "B" else f"{num_bytes:,.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:,.2f} GiB"
+
+
+def _same_gate(a, b):
+    # Two-qubit gates that undo each other when applied back to back
+    if a[0] != b[0] or a[0] not in TWO_QUBIT_GATES:
+        return False
+    if a[0] == "CNOT":
+        return a[1] == b[1]
+    return set(a[1]) == set(b[1])
+
+
+def fuse_gates(ops, atol=1e-12):
+    # Gate-fusion pass: every run of single-qubit gates on a wire becomes one
+    # FUSED_GATE op holding their product, and runs that multiply out to the
+    # identity (S·S†, T·T†, H·H, ...) disappear. Identical CNOT/CZ/SWAP
+    # pairs with nothing between them on either wire cancel too, which
+    # re-opens the single-qubit runs on both sides for further fusion.
+    fused = []
+    pending = {}   # wire -> product of single-qubit gates not yet emitted
+    wires = {}     # wire -> indices into `fused` of ops touching it, in order
+
+    def flush(qubit):
+        if qubit not in pending:
+            return
+        u = pending.pop(qubit)
+        if np.allclose(u, np.eye(2), atol=atol):
+            return
+        wires.setdefault(qubit, []).append(len(fused))
+        fused.append((FUSED_GATE, (qubit,), u))
+
+    def reopen(qubit):
+        # Pull a just-emitted fused gate back into `pending`
+        stack = wires.get(qubit)
+        if stack and fused[stack[-1]][0] == FUSED_GATE:
+            index = stack.pop()
+            pending[qubit] = fused[index][2]
+            fused[index] = None
+
+    for name, qubits, param in ops:
+        if name not in TWO_QUBIT_GATES:
+            qubit = qubits[0]
+            pending[qubit] = gate_matrix(name, param) @ pending.get(qubit, np.eye(2, dtype=np.complex128))
+            continue
+
+        a, b = qubits
+        flush(a)
+        flush(b)
+        stack_a, stack_b = wires.get(a), wires.get(b)
+        if stack_a and stack_b and stack_a[-1] == stack_b[-1] and _same_gate(fused[stack_a[-1]], (name, qubits)):
+            fused[stack_a[-1]] = None
+            wires[a].pop()
+            wires[b].pop()
+            reopen(a)
+            reopen(b)
+            continue
+        wires.setdefault(a, []).append(len(fused))
+        wires.setdefault(b, []).append(len(fused))
+        fused.append((name, qubits, param))
+
+    for qubit in list(pending):
+        flush(qubit)
+    return [op for op in fused if op is not None]
+
+
+def simulate_circuit(num_qubits, ops, fuse=False):
+    # `ops` is a list of (gate name, qubit tuple, angle or None); for CNOT
+    # the qubits are (control, target). With `fuse`, the circuit goes
+    # through fuse_gates() first and the pass is timed separately.
+    started = time.perf_counter()
+    run_ops = fuse_gates(ops) if fuse else ops
+    fusion_seconds = time.perf_counter() - started
+    simulator = StatevectorSimulator(num_qubits)
+    simulator.run(run_ops)
+    elapsed = time.perf_counter() - started
+    return {
+        "state": simulator.state,
+        "num_qubits": num_qubits,
+        "gate_count": len(ops),
+        "gates_simulated": len(run_ops),
+        "fusion_seconds": fusion_seconds,
+        "elapsed": elapsed,
+        "state_bytes": simulator.state.nbytes,
+        "memory_bytes": simulator.memory_bytes,
+    }
+
+
+def qubit_probabilities(state):
+    # P(qubit q = 1) for every qubit, accumulated one block at a time
+    num_qubits = state.size.bit_length() - 1
+    ones = np.zeros(num_qubits)
+    for start in range(0, state.size, BLOCK):
+        probabilities = np.abs(state[start:start + BLOCK]) ** 2
+        for qubit in range(num_qubits):
+            if (1 << (qubit + 1)) <= probabilities.size:
+                ones[qubit] += probabilities.reshape(-1, 2, 1 << qubit)[:, 1, :].sum()
+            elif (start >> qubit) & 1:
+                # Higher qubits are constant across the block
+                ones[qubit] += probabilities.sum()
+    return ones
+
+
+def top_outcomes(state, k=16, cutoff=1e-12):
+    # The k most likely basis states as (index, probability), without
+    # building the full 2**n probability array
+    candidates, weights = [], []
+    for start in range(0, state.size, BLOCK):
+        probabilities = np.abs(state[start:start + BLOCK]) ** 2
+        keep = np.argpartition(probabilities, -k)[-k:] if probabilities.size > k else np.arange(probabilities.size)
+        candidates.append(keep + start)
+        weights.append(probabilities[keep])
+    candidates, weights = np.concatenate(candidates), np.concatenate(weights)
+    order = np.argsort(weights)[::-1][:k]
+    return [(int(candidates[i]), float(weights[i])) for i in order if weights[i] > cutoff]
+
+
+def build_multi_qubit_circuit(num_qubits, ops):
+    from qiskit import QuantumCircuit
+
+    qc = QuantumCircuit(num_qubits)
+    for name, qubits, param in ops:
+        if name == FUSED_GATE:
+            qc.unitary(param, qubits, label=FUSED_GATE)
+            continue
+        method = getattr(qc, QISKIT_OPS[name])
+        if param is None:
+            method(*qubits)
+        else:
+            method(param, *qubits)
+    return qc
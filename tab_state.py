@@ -0,0 +1,143 @@
+import contextlib
+import contextvars
+import functools
+import time
+from collections import deque
+
+import numpy as np
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from profiler import PROCESS_TIMINGS, StageTimings, metrics_json, prometheus_text, summary_rows
+
+# Per-tab state for the Streamlit app. Every tab runs as its own st.fragment,
+# so a widget change only reruns the tab it belongs to. Results live in
+# st.session_state next to the inputs that produced them and are shown again
+# until those inputs change, and every tab run is timed for the debug view.
+# Inside a tab, `with stage("simulate"):` times one step of the run; see
+# profiler.py for the process-wide view and its exporters.
+
+# Runs kept per tab, and samples per stage, for this session's statistics
+LATENCY_WINDOW = 200
+
+# Tab whose body is running in this script thread, to label its stages
+_current_tab = contextvars.ContextVar("current_tab", default="App")
+
+
+def store_result(name, inputs, result):
+    st.session_state[f"result_{name}"] = (inputs, result)
+
+
+def last_result(name, inputs):
+    # The stored result, or None once any input differs from the ones it was
+    # computed with
+    stored = st.session_state.get(f"result_{name}")
+    if stored is not None and stored[0] == inputs:
+        return stored[1]
+    return None
+
+
+def _latency_log():
+    if "tab_latency" not in st.session_state:
+        st.session_state.tab_latency = {}
+    return st.session_state.tab_latency
+
+
+def _session_timings():
+    if "stage_timings" not in st.session_state:
+        st.session_state.stage_timings = StageTimings(LATENCY_WINDOW)
+    return st.session_state.stage_timings
+
+
+def _record(tab, name, elapsed):
+    _session_timings().record(tab, name, elapsed)
+    PROCESS_TIMINGS.record(tab, name, elapsed)
+
+
+def record_stage(name, seconds):
+    # For a stage timed by hand, where a `with stage()` block does not fit
+    _record(_current_tab.get(), name, seconds)
+
+
+@contextlib.contextmanager
+def stage(name):
+    # Times the block as one stage of the current tab, for this session and
+    # for the process. A block cut short by an exception (including a
+    # Streamlit rerun) is not recorded.
+    started = time.perf_counter()
+    yield
+    record_stage(name, time.perf_counter() - started)
+
+
+def latency_summary():
+    # One row per tab: run counts and median/p95/last rerun times in ms
+    rows = []
+    for name, runs in _latency_log().items():
+        seconds = np.array([elapsed for elapsed, _ in runs])
+        rows.append({
+            "Tab": name,
+            "Runs": len(runs),
+            "Fragment reruns": sum(1 for _, fragment in runs if fragment),
+            "Last (ms)": round(seconds[-1] * 1e3, 1),
+            "Median (ms)": round(float(np.median(seconds)) * 1e3, 1),
+            "p95 (ms)": round(float(np.percentile(seconds, 95)) * 1e3, 1),
+        })
+    return rows
+
+
+def tab_fragment(name):
+    # Decorator: run the tab body as an st.fragment and record how long each
+    # run took, and whether it was a rerun of this tab alone or part of a
+    # full script run. With the sidebar's debug toggle on, the tab ends with
+    # its own timing.
+    def decorate(body):
+        @st.fragment
+        @functools.wraps(body)
+        def run():
+            ctx = get_script_run_ctx()
+            fragment_rerun = bool(ctx and ctx.fragment_ids_this_run)
+            started = time.perf_counter()
+            token = _current_tab.set(name)
+            try:
+                body()
+            finally:
+                _current_tab.reset(token)
+            elapsed = time.perf_counter() - started
+            _record(name, "tab run", elapsed)
+
+            runs = _latency_log().setdefault(name, deque(maxlen=LATENCY_WINDOW))
+            runs.append((elapsed, fragment_rerun))
+            if st.session_state.get("debug_latency"):
+                st.caption(f"⏱️ {name}: {elapsed * 1e3:.1f} ms "
+                           f"({'tab rerun' if fragment_rerun else 'full run'}, {len(runs)} runs recorded)")
+        return run
+    return decorate
+
+
+@st.fragment
+def latency_panel():
+    # Sidebar debug view; its own fragment so Refresh picks up tab reruns
+    # without rerunning the page
+    st.markdown("### ⏱️ Tab Rerun Latency")
+    summary = latency_summary()
+    if summary:
+        st.dataframe(summary, use_container_width=True, hide_index=True)
+    else:
+        st.caption("No tab runs recorded yet.")
+
+    st.markdown("### 🔬 Stage Timings")
+    scope = st.radio("Scope:", ["This session", "Whole process"], horizontal=True, key="profiler_scope")
+    timings = _session_timings() if scope == "This session" else PROCESS_TIMINGS
+    stages = summary_rows(timings)
+    if stages:
+        st.dataframe(stages, use_container_width=True, hide_index=True)
+        col_a, col_b = st.columns(2)
+        with col_a:
+            st.download_button("Prometheus", prometheus_text(timings), file_name="stage_metrics.prom",
+                               mime="text/plain", key="profiler_prometheus", on_click="ignore", use_container_width=True)
+        with col_b:
+            st.download_button("JSON", metrics_json(timings) + "\n", file_name="stage_metrics.jsonl",
+                               mime="application/json", key="profiler_json", on_click="ignore", use_container_width=True)
+    else:
+        st.caption("No stages timed yet.")
+    st.button("🔄 Refresh", key="latency_refresh", use_container_width=True)